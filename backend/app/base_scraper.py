@@ -1,11 +1,17 @@
+import gzip
+import hashlib
+import os
 import random
+import re
 import time
 import logging
 import json
 import asyncio
 from typing import Dict, Optional, Any, List, Tuple, Union
 from dataclasses import dataclass, field
+from urllib.parse import urlsplit
 import aiohttp
+from bs4 import BeautifulSoup
 from aiohttp import ClientSession, ClientTimeout, ClientResponseError
 from fake_useragent import UserAgent
 from tenacity import (
@@ -24,12 +30,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Compiled once: normalize_price runs several times per product, and the
+# bound .sub skips the re-cache lookup on every call
+_PRICE_STRIP_RE = re.compile(r'[^\d.]')
+
+# Directory for cached pages, alongside the sessions directory
+_PAGE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "cache")
+
 @dataclass
 class RequestConfig:
     """Configuration for HTTP requests."""
     timeout: int = 30
     max_retries: int = 3
     delay_range: Tuple[float, float] = (1.0, 3.0)
+    requests_per_second: float = 1.0
     
 @dataclass
 class ScraperConfig:
@@ -38,13 +52,48 @@ class ScraperConfig:
     proxy_list: List[str] = field(default_factory=list)
     user_agent_rotator: Optional[UserAgent] = field(default_factory=UserAgent)
 
+class _TokenBucket:
+    """Minimal async token bucket for per-domain request pacing.
+
+    Waiting is cooperative (asyncio.sleep), so pacing one domain never
+    blocks requests to other domains the way a thread sleep would.
+    """
+
+    def __init__(self, rate: float, capacity: float = 2.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, then consume it."""
+        # Holding the lock while waiting keeps same-domain callers in
+        # arrival order; other domains use other buckets
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
 class BaseScraper:
     """Base class for all scrapers with common functionality."""
-    
+
+    # Shared across instances so every scraper hitting the same domain
+    # drains from the same bucket
+    _limiters: Dict[str, _TokenBucket] = {}
+
     def __init__(self, config: Optional[ScraperConfig] = None):
         """Initialize the base scraper with configuration."""
         self.config = config or ScraperConfig()
         self.session = None
+        self._last_cache_prune = 0.0
         self._initialize_components()
     
     def _initialize_components(self):
@@ -65,10 +114,14 @@ class BaseScraper:
         await self.close_session()
     
     async def start_session(self):
-        """Start a new aiohttp session."""
+        """Start a new aiohttp session with pooled keep-alive connections."""
         if self.session is None or self.session.closed:
             timeout = ClientTimeout(total=self.config.request_config.timeout)
-            self.session = ClientSession(timeout=timeout)
+            # Keep-alive pooling: every page after the first to the same
+            # host reuses TCP+TLS state instead of re-handshaking, which
+            # is most of the cost of a paginated crawl
+            connector = aiohttp.TCPConnector(limit=16, limit_per_host=16)
+            self.session = ClientSession(timeout=timeout, connector=connector)
     
     async def close_session(self):
         """Close the aiohttp session."""
@@ -126,13 +179,26 @@ class BaseScraper:
             
         return headers
     
+    def _get_limiter(self, url: str) -> _TokenBucket:
+        """Get (or create) the shared token bucket for a URL's domain."""
+        domain = urlsplit(url).netloc
+        limiter = self._limiters.get(domain)
+        if limiter is None:
+            limiter = self._limiters.setdefault(
+                domain, _TokenBucket(self.config.request_config.requests_per_second)
+            )
+        return limiter
+
     async def _make_request(self, url: str, method: str = 'GET', **kwargs) -> Optional[str]:
         """Make an HTTP request with retries and error handling."""
         attempt = 0
         max_attempts = self.config.request_config.max_retries + 1  # +1 for the initial attempt
-        
+        limiter = self._get_limiter(url)
+
         while attempt < max_attempts:
             attempt += 1
+            # Steady per-domain pacing; replaces the old fixed random delay
+            await limiter.acquire()
             proxy = self.get_random_proxy()
             proxy_url = f"http://{proxy}" if proxy else None
             
@@ -194,13 +260,88 @@ class BaseScraper:
                 
         return None
     
-    async def get(self, url: str, **kwargs) -> Optional[str]:
-        """Make a GET request."""
-        return await self._make_request(url, 'GET', **kwargs)
+    @staticmethod
+    def _page_cache_path(url: str, params: Optional[Dict[str, Any]]) -> str:
+        """Path of the cached copy of a page (sha256-named, gzip-compressed)."""
+        key = hashlib.sha256(
+            f"{url}|{sorted((params or {}).items())}".encode('utf-8')
+        ).hexdigest()
+        return os.path.join(_PAGE_CACHE_DIR, f"{key}.html.gz")
+
+    @staticmethod
+    def _read_cached_page(path: str, ttl: float) -> Optional[str]:
+        """Read a cached page if it exists and is younger than ttl (blocking)."""
+        try:
+            if time.time() - os.path.getmtime(path) > ttl:
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_cached_page(self, path: str, text: str) -> None:
+        """Write a page to the disk cache and prune stale entries (blocking)."""
+        try:
+            os.makedirs(_PAGE_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache page to {path}: {e}")
+            return
+
+        # Opportunistic prune, throttled like cleanup_expired_sessions
+        now = time.time()
+        if now - self._last_cache_prune < 3600:
+            return
+        self._last_cache_prune = now
+        try:
+            with os.scandir(_PAGE_CACHE_DIR) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.html.gz') and now - entry.stat().st_mtime > 3600:
+                        os.remove(entry.path)
+        except OSError as e:
+            logger.warning(f"Page cache prune failed: {e}")
+
+    async def get(self, url: str, cache_ttl: Optional[float] = None, **kwargs) -> Optional[str]:
+        """Make a GET request, optionally served from the disk page cache.
+
+        With cache_ttl set, a repeat of the same URL+params within the TTL
+        is a sub-ms gzip read from disk instead of a network round trip.
+        """
+        if cache_ttl:
+            cache_path = self._page_cache_path(url, kwargs.get('params'))
+            cached = await asyncio.to_thread(self._read_cached_page, cache_path, cache_ttl)
+            if cached is not None:
+                logger.debug(f"Page cache hit for {url}")
+                return cached
+
+        text = await self._make_request(url, 'GET', **kwargs)
+        if cache_ttl and text is not None:
+            await asyncio.to_thread(self._write_cached_page, cache_path, text)
+        return text
     
     async def post(self, url: str, **kwargs) -> Optional[str]:
         """Make a POST request."""
         return await self._make_request(url, 'POST', **kwargs)
+
+    async def get_soup(self, url: str, **kwargs) -> Optional[BeautifulSoup]:
+        """Fetch a URL and parse it with BeautifulSoup (lxml parser)."""
+        html = await self.get(url, **kwargs)
+        if html is None:
+            return None
+        return BeautifulSoup(html, 'lxml')
+
+    def normalize_price(self, price_str: Optional[str]) -> Optional[float]:
+        """Convert a displayed price string (e.g. '₹1,23,456.00') to a float."""
+        if not price_str:
+            return None
+        cleaned = _PRICE_STRIP_RE.sub('', price_str)
+        try:
+            return float(cleaned) if cleaned else None
+        except ValueError:
+            return None
     
     async def extract_data(self, html: str) -> Dict[str, Any]:
         """Extract data from HTML. To be implemented by subclasses."""
@@ -211,10 +352,7 @@ class BaseScraper:
         html = await self.get(url)
         if not html:
             return None
-        
-        # Add a random delay between requests
-        if self.config.request_config.delay_range:
-            delay = random.uniform(*self.config.request_config.delay_range)
-            await asyncio.sleep(delay)
-        
+
+        # Per-domain pacing happens in _make_request via the token bucket,
+        # so no extra delay is needed here
         return await self.extract_data(html)
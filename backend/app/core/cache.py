@@ -3,7 +3,8 @@ Redis-based caching utilities for the application
 """
 import json
 import logging
-from typing import Any, Optional, TypeVar, Type, Callable, Dict, Union
+from collections import OrderedDict
+from typing import Any, Optional, Tuple, TypeVar, Type, Callable, Dict, Union
 from functools import wraps
 import time
 
@@ -12,6 +13,38 @@ from .redis_client import get_redis_client
 logger = logging.getLogger(__name__)
 T = TypeVar('T')
 
+class _TTLCache:
+    """Minimal in-memory TTL cache with LRU eviction (no external deps)"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: int = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = (value, time.monotonic() + (ttl or self.ttl))
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
 class CacheManager:
     """Redis-based cache manager with TTL support"""
     
@@ -30,6 +63,21 @@ class CacheManager:
     def _get_key(self, key: str) -> str:
         """Get the full cache key with prefix"""
         return f"{self.prefix}{key}"
+
+    @staticmethod
+    def _loads(data: Any, model: Type[T] = None) -> Any:
+        """Deserialize a cached value"""
+        if model:
+            return model.parse_raw(data)
+        return json.loads(data)
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        """Serialize a value for caching"""
+        if hasattr(value, 'json'):
+            # Handle Pydantic models
+            return value.json()
+        return json.dumps(value, default=str)
     
     async def get(self, key: str, model: Type[T] = None) -> Optional[T]:
         """
@@ -46,14 +94,12 @@ class CacheManager:
             return None
             
         try:
-            data = await self.redis.get(self._get_key(key))
+            data = self.redis.get(self._get_key(key))
             if not data:
                 return None
-                
-            if model:
-                return model.parse_raw(data)
-            return json.loads(data)
-            
+
+            return self._loads(data, model)
+
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {str(e)}")
             return None
@@ -82,22 +128,15 @@ class CacheManager:
             
         try:
             cache_key = self._get_key(key)
-            if serialize:
-                if hasattr(value, 'json'):
-                    # Handle Pydantic models
-                    serialized = value.json()
-                else:
-                    serialized = json.dumps(value, default=str)
-            else:
-                serialized = value
-                
+            serialized = self._dumps(value) if serialize else value
+
             ttl = ttl if ttl is not None else self.default_ttl
-            
+
             if ttl > 0:
-                return await self.redis.setex(cache_key, ttl, serialized)
+                return bool(self.redis.setex(cache_key, ttl, serialized))
             else:
-                return await self.redis.set(cache_key, serialized)
-                
+                return bool(self.redis.set(cache_key, serialized))
+
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {str(e)}")
             return False
@@ -114,7 +153,7 @@ class CacheManager:
             
         try:
             prefixed_keys = [self._get_key(k) for k in keys]
-            return await self.redis.delete(*prefixed_keys)
+            return self.redis.delete(*prefixed_keys)
         except Exception as e:
             logger.error(f"Cache delete error for keys {keys}: {str(e)}")
             return 0
@@ -131,11 +170,11 @@ class CacheManager:
             
         try:
             pattern = self._get_key(pattern)
-            keys = await self.redis.keys(pattern)
+            keys = self.redis.keys(pattern)
             if not keys:
                 return 0
-                
-            return await self.redis.delete(*keys)
+
+            return self.redis.delete(*keys)
         except Exception as e:
             logger.error(f"Cache clear error for pattern {pattern}: {str(e)}")
             return 0
@@ -179,5 +218,107 @@ class CacheManager:
             return wrapper
         return decorator
 
+class FallbackCacheManager(CacheManager):
+    """CacheManager that keeps serving hits while Redis is down.
+
+    Entries are stored in Redis while it is healthy. On a Redis error the
+    manager flips to a bounded in-memory TTL cache so the hit rate stays
+    non-zero during outages, and probes the primary every
+    `probe_interval` seconds. On recovery the local cache is cleared so
+    entries that went stale during the outage can't shadow fresher data
+    written by other workers.
+    """
+
+    def __init__(self, prefix: str = "cache:", default_ttl: int = 3600,
+                 maxsize: int = 10_000, probe_interval: float = 30.0):
+        super().__init__(prefix=prefix, default_ttl=default_ttl)
+        self._fallback = _TTLCache(maxsize=maxsize, ttl=default_ttl)
+        self._using_fallback = self.redis is None
+        self._probe_interval = probe_interval
+        self._last_probe = 0.0
+
+    def _primary_ok(self) -> bool:
+        """Whether to try Redis, probing a failed primary periodically"""
+        if not self._using_fallback:
+            return self.redis is not None
+        if self.redis is None:
+            return False
+
+        now = time.monotonic()
+        if now - self._last_probe < self._probe_interval:
+            return False
+        self._last_probe = now
+        try:
+            self.redis.ping()
+        except Exception:
+            return False
+
+        self._fallback.clear()
+        self._using_fallback = False
+        logger.info("Redis recovered; cache switched back to primary")
+        return True
+
+    def _switch_to_fallback(self) -> None:
+        if not self._using_fallback:
+            self._using_fallback = True
+            self._last_probe = time.monotonic()
+            logger.warning("Redis unavailable; cache switched to in-memory fallback")
+
+    async def get(self, key: str, model: Type[T] = None) -> Optional[T]:
+        cache_key = self._get_key(key)
+
+        if self._primary_ok():
+            try:
+                data = self.redis.get(cache_key)
+                return self._loads(data, model) if data else None
+            except Exception as e:
+                logger.error(f"Cache get error for key {key}: {str(e)}")
+                self._switch_to_fallback()
+
+        data = self._fallback.get(cache_key)
+        if data is None:
+            return None
+        try:
+            return self._loads(data, model)
+        except Exception as e:
+            logger.error(f"Fallback cache decode error for key {key}: {str(e)}")
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int = None, serialize: bool = True) -> bool:
+        cache_key = self._get_key(key)
+        try:
+            serialized = self._dumps(value) if serialize else value
+        except Exception as e:
+            logger.error(f"Cache set error for key {key}: {str(e)}")
+            return False
+        ttl = ttl if ttl is not None else self.default_ttl
+
+        if self._primary_ok():
+            try:
+                if ttl > 0:
+                    return bool(self.redis.setex(cache_key, ttl, serialized))
+                return bool(self.redis.set(cache_key, serialized))
+            except Exception as e:
+                logger.error(f"Cache set error for key {key}: {str(e)}")
+                self._switch_to_fallback()
+
+        self._fallback.set(cache_key, serialized, ttl if ttl > 0 else None)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        prefixed_keys = [self._get_key(k) for k in keys]
+        for cache_key in prefixed_keys:
+            self._fallback.delete(cache_key)
+
+        if self._primary_ok():
+            try:
+                return self.redis.delete(*prefixed_keys)
+            except Exception as e:
+                logger.error(f"Cache delete error for keys {keys}: {str(e)}")
+                self._switch_to_fallback()
+        return 0
+
 # Default cache instance
-cache = CacheManager(prefix="price_compare:", default_ttl=3600)
+cache = FallbackCacheManager(prefix="price_compare:", default_ttl=3600)
@@ -54,7 +54,16 @@ class Settings(BaseSettings):
     EBAY_PRODUCT_CACHE_TTL: int = 86400  # 24 hours
     EBAY_SEARCH_CACHE_TTL: int = 3600  # 1 hour
     
+    # Amazon PA-API Settings
+    AMAZON_ACCESS_KEY: str = os.getenv("AMAZON_ACCESS_KEY", "")
+    AMAZON_SECRET_KEY: str = os.getenv("AMAZON_SECRET_KEY", "")
+    AMAZON_PARTNER_TAG: str = os.getenv("AMAZON_PARTNER_TAG", "")
+    AMAZON_HOST: str = os.getenv("AMAZON_HOST", "webservices.amazon.com")
+    AMAZON_REGION: str = os.getenv("AMAZON_REGION", "us-east-1")
+    AMAZON_API_TIMEOUT: int = 10  # seconds
+
     # Feature Flags
+    ENABLE_AMAZON_API: bool = os.getenv("ENABLE_AMAZON_API", "false").lower() == "true"
     ENABLE_EBAY_API: bool = os.getenv("ENABLE_EBAY_API", "true").lower() == "true"
     ENABLE_SAFE_BROWSING: bool = os.getenv("ENABLE_SAFE_BROWSING", "true").lower() == "true"
     
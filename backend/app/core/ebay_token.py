@@ -1,3 +1,4 @@
+import asyncio
 import os
 import base64
 import time
@@ -196,9 +197,12 @@ class EBayTokenManager:
             oauth_url = "https://api.ebay.com/identity/v1/oauth2/token"
             logger.info(f"Sending OAuth request to: {oauth_url}")
             
-            # Make the actual request to eBay OAuth endpoint
-            import requests
-            response = requests.post(oauth_url, headers=headers, data=data)
+            # Make the actual request to eBay OAuth endpoint. requests is
+            # blocking, so run it in a worker thread to keep the event loop
+            # free for other coroutines while we wait on the network.
+            response = await asyncio.to_thread(
+                requests.post, oauth_url, headers=headers, data=data, timeout=10
+            )
             response.raise_for_status()
             
             # Parse the response
@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 import os
 from dotenv import load_dotenv
 from .models import Base, Product, Offer, User  # Import models from models.py
@@ -27,6 +28,59 @@ def get_db():
     finally:
         db.close()
 
+# Shared async engine/session factory for async consumers (StorageManager).
+# One pooled engine per process amortizes connection handshakes across
+# requests instead of reconnecting per call.
+_async_engine = None
+_async_session_factory = None
+
+def _async_database_url(url: str) -> str:
+    """Map the configured URL onto its async driver."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+def get_async_engine():
+    """Get (creating on first use) the process-wide async engine."""
+    global _async_engine
+    if _async_engine is None:
+        url = _async_database_url(DATABASE_URL)
+        pool_kwargs = {} if url.startswith("sqlite") else {
+            "pool_size": 20,
+            "max_overflow": 10,
+            "pool_recycle": 1800,
+        }
+        _async_engine = create_async_engine(url, **pool_kwargs)
+    return _async_engine
+
+def get_async_session_factory():
+    """Session factory bound to the shared engine.
+
+    expire_on_commit=False so attributes (e.g. generated ids) stay
+    readable after commit without a refetch.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), expire_on_commit=False, autoflush=False
+        )
+    return _async_session_factory
+
+# Dependency to get an async DB session: one session and one commit per
+# request (unit of work)
+async def get_async_db():
+    session = get_async_session_factory()()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
 # Drop all tables and recreate them
 def create_tables():
     """Drop and recreate all tables in the database."""
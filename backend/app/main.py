@@ -22,7 +22,7 @@ from slowapi.util import get_remote_address
 from .middleware.safe_browsing_middleware import SafeBrowsingMiddleware
 from .middleware.error_handler import ErrorHandlerMiddleware, setup_error_handlers
 from .core.monitoring import MonitorRoute, metrics_endpoint
-from .core.cache import CacheManager
+from .core.cache import FallbackCacheManager
 from .core.redis_client import init_redis
 from .core.ebay_token import EBayTokenManager
 from .services.ebay_service import EBayService
@@ -65,7 +65,7 @@ async def lifespan(app: FastAPI):
         
         # Initialize services
         services['redis'] = redis_client
-        services['cache'] = CacheManager(prefix="price_compare:", default_ttl=3600)
+        services['cache'] = FallbackCacheManager(prefix="price_compare:", default_ttl=3600)
         services['token_manager'] = EBayTokenManager(redis_client)
         services['ebay_service'] = EBayService()
         
@@ -92,6 +92,8 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown logic
         logger.info("Shutting down services...")
+        if 'ebay_service' in services:
+            await services['ebay_service'].aclose()
         if 'redis' in services:
             await services['redis'].close()
         logger.info("Services shut down successfully")
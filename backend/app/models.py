@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, func, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, func, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -29,15 +29,24 @@ class Product(Base):
     __tablename__ = 'products'
     
     id = Column(Integer, primary_key=True, index=True)
+    # Dedup key (blake2b of source:url); unique index makes the per-save
+    # lookup and the upsert conflict target a B-tree probe, not a scan
+    product_key = Column(String(32), unique=True, index=True, nullable=True)
     name = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
+    url = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+    brand = Column(String, nullable=True)
     category = Column(String, nullable=True)
     price = Column(Float, nullable=True)
+    current_price = Column(Float, nullable=True)
+    currency = Column(String, nullable=True, default='USD')
     source = Column(String, nullable=True)  # e.g., 'ebay'
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+    # server_default so writers that bypass the ORM (raw SQL, bulk
+    # loads) still get timestamps without shipping them per row
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
+
     # Relationships
     offers = relationship("Offer", back_populates="product")
     search_results = relationship("SearchResult", back_populates="product")
@@ -53,9 +62,9 @@ class Offer(Base):
     discount = Column(Float, nullable=True)
     url = Column(String, nullable=False)
     website = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now())
+
     # Relationships
     product = relationship("Product", back_populates="offers")
 
@@ -92,8 +101,8 @@ class PriceSnapshot(Base):
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey('products.id'), nullable=False)
     price = Column(Float, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
-    
+    timestamp = Column(DateTime, default=datetime.utcnow, server_default=func.now())
+
     # Relationships
     product = relationship("Product", back_populates="price_history")
 
@@ -101,6 +110,21 @@ class PriceSnapshot(Base):
 Product.price_history = relationship("PriceSnapshot", order_by=PriceSnapshot.timestamp, back_populates="product")
 
 
+class PriceHistory(Base):
+    __tablename__ = 'price_history'
+    # Composite index covers the product_id filter plus the created_at
+    # ordering used by get_product_history, so no sort is needed
+    __table_args__ = (
+        Index('ix_price_history_product_created', 'product_id', 'created_at'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey('products.id'), nullable=False)
+    price = Column(Float, nullable=False)
+    currency = Column(String, default='USD')
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Watch(Base):
     __tablename__ = 'watches'
     
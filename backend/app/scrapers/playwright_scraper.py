@@ -2,7 +2,9 @@ import asyncio
 import logging
 import random
 import time
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlparse
 
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext, TimeoutError
 from ..utils.cookie_manager import cookie_manager
@@ -10,19 +12,93 @@ from ..utils.captcha_handler import captcha_handler
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1024)
+def _extract_domain(url: str) -> str:
+    """Extract the domain (without www.) from a URL.
+
+    Cached because a scraper session hits the same few domains repeatedly.
+    """
+    domain = urlparse(url).netloc
+    return domain[4:] if domain.startswith('www.') else domain
+
+# Installed once per context so every page inherits it; patching only
+# navigator.webdriver is not enough for modern anti-bot fingerprinting
+# and CAPTCHA loops are far more expensive than the extra patches
+_STEALTH_INIT_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+Object.defineProperty(navigator, 'vendor', { get: () => 'Google Inc.' });
+Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
+Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+window.chrome = window.chrome || { runtime: {} };
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications'
+        ? Promise.resolve({ state: Notification.permission })
+        : originalQuery(parameters)
+);
+"""
+
+# Shared browser process: Chromium cold start is 300-1500ms, so all
+# scraper instances reuse one Browser and only create contexts (~10ms)
+_shared_playwright = None
+_shared_browser: Optional[Browser] = None
+_browser_lock = asyncio.Lock()
+
+async def _get_shared_browser(headless: bool = True) -> Browser:
+    """Get (launching if needed) the process-wide shared Browser."""
+    global _shared_playwright, _shared_browser
+    async with _browser_lock:
+        if _shared_browser is None or not _shared_browser.is_connected():
+            if _shared_playwright is None:
+                _shared_playwright = await async_playwright().start()
+            _shared_browser = await _shared_playwright.chromium.launch(
+                headless=headless,
+                args=['--disable-blink-features=AutomationControlled']
+            )
+        return _shared_browser
+
+async def shutdown_browser():
+    """Dispose of the shared Browser and Playwright driver (app shutdown)."""
+    global _shared_playwright, _shared_browser
+    async with _browser_lock:
+        if _shared_browser is not None:
+            await _shared_browser.close()
+            _shared_browser = None
+        if _shared_playwright is not None:
+            await _shared_playwright.stop()
+            _shared_playwright = None
+
 class PlaywrightScraper:
     """A headless browser scraper using Playwright with cookie management."""
     
-    def __init__(self, headless: bool = True, use_cookies: bool = True):
+    # Resource classes that never affect extracted data; often tens of MB
+    # of images/fonts/trackers per commerce page
+    DEFAULT_BLOCKED_RESOURCES = frozenset({'image', 'font', 'media'})
+
+    def __init__(self, headless: bool = True, use_cookies: bool = True,
+                 wait_for_network_idle: bool = False,
+                 blocked_resource_types: Optional[set] = None):
         """
         Initialize the Playwright scraper.
-        
+
         Args:
             headless: Whether to run browser in headless mode
             use_cookies: Whether to enable cookie management
+            wait_for_network_idle: Wait for 'networkidle' after navigation.
+                Off by default: trackers on commerce pages keep the network
+                busy and often run this wait to its full timeout. Prefer
+                passing a wait_for selector to get_page_content instead.
+            blocked_resource_types: Resource types to abort before the
+                request is issued. Defaults to images/fonts/media; add
+                'stylesheet' only if no selector depends on rendered CSS.
+                Pass an empty set to disable blocking.
         """
         self.headless = headless
         self.use_cookies = use_cookies
+        self.wait_for_network_idle = wait_for_network_idle
+        if blocked_resource_types is None:
+            blocked_resource_types = self.DEFAULT_BLOCKED_RESOURCES
+        self.blocked_resource_types = frozenset(blocked_resource_types)
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
@@ -38,15 +114,9 @@ class PlaywrightScraper:
         await self.close()
         
     async def start(self):
-        """Start Playwright browser with anti-detection settings."""
-        self.playwright = await async_playwright().start()
-        
-        # Launch browser with stealth settings
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        
+        """Start a browser context on the shared browser with anti-detection settings."""
+        self.browser = await _get_shared_browser(self.headless)
+
         # Create a new browser context
         self.context = await self.browser.new_context(
             viewport={'width': 1920, 'height': 1080},
@@ -54,29 +124,29 @@ class PlaywrightScraper:
             timezone_id='America/New_York'
         )
         
+        # Apply stealth settings at context level so all pages inherit them
+        await self.context.add_init_script(_STEALTH_INIT_SCRIPT)
+
+        # Abort bandwidth-heavy resource requests before they are issued
+        if self.blocked_resource_types:
+            await self.context.route('**/*', self._route_filter)
+
         # Create a new page
         self.page = await self.context.new_page()
         
-        # Apply stealth settings
-        await self.page.add_init_script("""
-        Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-        """)
-        
     async def close(self):
-        """Close the browser and save cookies if enabled."""
+        """Close this scraper's page and context, saving cookies if enabled.
+
+        The shared browser stays up for other scraper instances; use
+        shutdown_browser() to dispose of it at application shutdown.
+        """
         if self.page:
             if self.use_cookies and self.domain:
                 await self._save_cookies()
             await self.page.close()
-            
+
         if self.context:
             await self.context.close()
-            
-        if self.browser:
-            await self.browser.close()
-            
-        if hasattr(self, 'playwright') and self.playwright:
-            await self.playwright.stop()
     
     async def get_page_content(
         self, 
@@ -102,7 +172,7 @@ class PlaywrightScraper:
             
         self.start_time = time.time()
         timeout = timeout or self.timeout
-        self.domain = self._extract_domain(url)
+        self.domain = _extract_domain(url)
         
         try:
             # Load cookies if enabled
@@ -114,30 +184,39 @@ class PlaywrightScraper:
             if not success:
                 return None, False
             
+            # Serialize the DOM once; page.content() is O(page size) and
+            # can be tens of MB, so reuse it for CAPTCHA detection and the
+            # return value on the common path
+            content = await self.page.content()
+
             # Handle CAPTCHA if detected
-            if handle_captcha:
-                page_content = await self.page.content()
-                if await captcha_handler.detect_captcha(page_content):
-                    logger.warning("CAPTCHA detected, attempting to solve...")
-                    if not await captcha_handler.handle_captcha(self.page):
-                        logger.error("Failed to solve CAPTCHA")
-                        return None, False
-            
+            if handle_captcha and await captcha_handler.detect_captcha(content):
+                logger.warning("CAPTCHA detected, attempting to solve...")
+                # On success the handler returns the post-clear HTML it
+                # already serialized to confirm the challenge was gone
+                content = await captcha_handler.handle_captcha(self.page)
+                if content is None:
+                    logger.error("Failed to solve CAPTCHA")
+                    return None, False
+
             # Wait for specific element if requested
             if wait_for:
                 try:
                     await self.page.wait_for_selector(
-                        wait_for, 
+                        wait_for,
                         timeout=min(10000, timeout)
                     )
+                    content = None  # DOM may have changed; re-read below
                 except TimeoutError:
                     logger.warning(f"Timed out waiting for selector: {wait_for}")
-            
+
             # Save cookies if enabled
             if self.use_cookies and self.domain:
                 await self._save_cookies()
-                
-            return await self.page.content(), True
+
+            if content is None:
+                content = await self.page.content()
+            return content, True
             
         except Exception as e:
             logger.error(f"Error getting page content: {e}")
@@ -148,6 +227,13 @@ class PlaywrightScraper:
                     logger.error(f"Failed to take screenshot: {screenshot_error}")
             return None, False
     
+    async def _route_filter(self, route):
+        """Abort requests for blocked resource types, continue everything else."""
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def _navigate_with_retries(self, url: str, timeout: int, max_retries: int = 3) -> bool:
         """Navigate to URL with retries and error handling."""
         for attempt in range(max_retries):
@@ -166,14 +252,16 @@ class PlaywrightScraper:
                 
                 # Navigate to the URL
                 await self.page.goto(
-                    url, 
+                    url,
                     wait_until='domcontentloaded',
                     timeout=remaining_timeout
                 )
-                
-                # Wait for page to fully load
-                await self.page.wait_for_load_state('networkidle')
-                
+
+                # Only wait for full network quiescence when opted in;
+                # callers normally wait on a specific selector instead
+                if self.wait_for_network_idle:
+                    await self.page.wait_for_load_state('networkidle')
+
                 return True
                 
             except TimeoutError:
@@ -211,11 +299,38 @@ class PlaywrightScraper:
         if cookies:
             await cookie_manager.save_cookies(self.domain, cookies)
     
-    def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL."""
-        from urllib.parse import urlparse
-        domain = urlparse(url).netloc
-        # Remove www. prefix if present
-        if domain.startswith('www.'):
-            domain = domain[4:]
-        return domain
+    @classmethod
+    async def scrape_urls(
+        cls,
+        urls: List[str],
+        max_concurrency: int = 8,
+        wait_for: str = None,
+        **scraper_kwargs
+    ) -> Dict[str, Optional[str]]:
+        """
+        Fetch many URLs concurrently over the shared browser.
+
+        Each URL gets its own context (so cookies/stealth state stay
+        isolated) but all contexts share one Chromium process; a semaphore
+        bounds concurrency since 8-16 contexts saturate a single browser.
+
+        Args:
+            urls: URLs to fetch
+            max_concurrency: Maximum number of contexts open at once
+            wait_for: Optional CSS selector to wait for on each page
+            **scraper_kwargs: Passed through to the PlaywrightScraper constructor
+
+        Returns:
+            Dict mapping each URL to its page content (None on failure)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(url: str) -> Optional[str]:
+            async with semaphore:
+                async with cls(**scraper_kwargs) as scraper:
+                    content, success = await scraper.get_page_content(url, wait_for=wait_for)
+                    return content if success else None
+
+        contents = await asyncio.gather(*(fetch(url) for url in urls))
+        return dict(zip(urls, contents))
+
@@ -0,0 +1,269 @@
+"""
+Site-specific HTML scrapers for Amazon and Flipkart search results.
+
+Built on the async BaseScraper so the per-site searches overlap on the
+network instead of running back to back; a full multi-site search costs
+roughly the slowest single site.
+"""
+import asyncio
+import logging
+import re
+from typing import Dict, List, Optional, Any
+
+from lxml import etree
+
+from ..base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+# Deletion table for str.translate: strips every non-digit in a single
+# C loop with no per-character Python dispatch. Discount strings are
+# usually ASCII ("20% off"), so a latin-1 table covers the common case;
+# percent labels carrying code points above latin-1 fall back to the
+# digit regex below.
+_KEEP_DIGITS = str.maketrans(
+    '', '', ''.join(chr(c) for c in range(256) if not chr(c).isdigit())
+)
+_DIGITS_RE = re.compile(r'\d+')
+
+# Repeated searches within this window serve the page from the disk cache
+# instead of re-fetching it
+SEARCH_CACHE_TTL = 300
+
+# Precompiled XPath selectors. Going through lxml directly skips BS4's
+# per-node Python object construction and its CSS-to-XPath translation
+# on every select() call.
+#
+# The Amazon fields come from one fused union expression: a single walk
+# of the card subtree yields title, price, link and image nodes in
+# document order, instead of four independent traversals.
+_AMZ_FIELDS = etree.XPath(
+    './/h2//a[contains(@class, "a-link-normal")]'
+    ' | .//h2//span'
+    ' | .//span[contains(@class, "a-price")]/span[contains(@class, "a-offscreen")]'
+    ' | .//img[contains(@class, "s-image")]'
+)
+
+_FLP_TITLE = etree.XPath(
+    './/div[contains(@class, "_4rR01T")] | .//a[contains(@class, "s1Q9rs")]'
+)
+_FLP_PRICE = etree.XPath('.//div[contains(@class, "_30jeq3")]')
+_FLP_DISCOUNT = etree.XPath('.//div[contains(@class, "_3Ay6Sb")]//span')
+_FLP_LINK = etree.XPath(
+    './/a[contains(@class, "_1fQZEK")]/@href | .//a[contains(@class, "s1Q9rs")]/@href'
+)
+_FLP_IMAGE = etree.XPath('.//img[contains(@class, "_396cs4")]/@src')
+
+def _text(elem) -> str:
+    """Concatenated text of an element (pull-parsed nodes are plain _Element)"""
+    return ''.join(elem.itertext())
+
+def _iter_result_items(page: str, is_item):
+    """Incrementally parse a search page, yielding matching result divs.
+
+    Search pages run to hundreds of KB but we only touch the ~10 result
+    subtrees, so feed the pull parser in chunks and free each consumed
+    item (plus everything parsed before it) instead of holding the full
+    DOM, which is typically several times the size of the HTML itself.
+    """
+    parser = etree.HTMLPullParser(events=('end',))
+    chunk_size = 16384
+    for start in range(0, len(page), chunk_size):
+        parser.feed(page[start:start + chunk_size])
+        for _, elem in parser.read_events():
+            if elem.tag == 'div' and is_item(elem):
+                yield elem
+                # Release the consumed subtree and its parsed siblings
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+    parser.close()
+
+def _is_amazon_result(elem) -> bool:
+    return elem.get('data-component-type') == 's-search-result'
+
+def _is_flipkart_result(elem) -> bool:
+    return '_1AtVbE' in (elem.get('class') or '')
+
+class AmazonScraper(BaseScraper):
+    """Scraper for Amazon search result pages."""
+
+    BASE_URL = "https://www.amazon.in"
+
+    async def search_products(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search Amazon and extract products from the results page.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of products to return
+
+        Returns:
+            List of product dicts (may be empty on fetch/parse failure)
+        """
+        page = await self.get(
+            f"{self.BASE_URL}/s", params={"k": query}, cache_ttl=SEARCH_CACHE_TTL
+        )
+        if page is None:
+            return []
+        # Cheap C-level substring scan before any parsing: error and
+        # empty-result pages simply lack the result-card marker
+        if 'data-component-type="s-search-result"' not in page:
+            return []
+
+        products = []
+        for item in _iter_result_items(page, _is_amazon_result):
+            # One subtree walk; dispatch each node on tag/class
+            title = price = link = image = None
+            for node in _AMZ_FIELDS(item):
+                tag = node.tag
+                if tag == 'span':
+                    if 'a-offscreen' in (node.get('class') or ''):
+                        if price is None:
+                            price = _text(node)
+                    elif title is None:
+                        title = _text(node).strip()
+                elif tag == 'a' and link is None:
+                    link = node.get('href')
+                elif tag == 'img' and image is None:
+                    image = node.get('src')
+            if not title:
+                continue
+            products.append({
+                'site': 'amazon',
+                'title': title,
+                'price': self.normalize_price(price),
+                'currency': 'INR',
+                'url': f"{self.BASE_URL}{link}" if link else None,
+                'image_url': image,
+            })
+            if len(products) >= max_results:
+                break
+        return products
+
+class FlipkartScraper(BaseScraper):
+    """Scraper for Flipkart search result pages."""
+
+    BASE_URL = "https://www.flipkart.com"
+
+    async def search_products(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Search Flipkart and extract products from the results page.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of products to return
+
+        Returns:
+            List of product dicts (may be empty on fetch/parse failure)
+        """
+        page = await self.get(
+            f"{self.BASE_URL}/search", params={"q": query}, cache_ttl=SEARCH_CACHE_TTL
+        )
+        if page is None:
+            return []
+        # Same marker sniff as Amazon: skip parsing pages with no cards
+        if '_1AtVbE' not in page:
+            return []
+
+        products = []
+        q = query.lower()
+        for item in _iter_result_items(page, _is_flipkart_result):
+            # Title first: sponsored/unrelated cards are common, and
+            # rejecting on the title skips the other four XPath walks
+            titles = _FLP_TITLE(item)
+            if not titles:
+                continue
+            title = _text(titles[0]).strip()
+            if q not in title.lower():
+                continue
+            prices = _FLP_PRICE(item)
+            discounts = _FLP_DISCOUNT(item)
+            links = _FLP_LINK(item)
+            images = _FLP_IMAGE(item)
+
+            discount = None
+            if discounts:
+                label = _text(discounts[0])
+                # Percentage discounts only: flat ones ("₹500 off")
+                # would otherwise report a rupee amount as a percent
+                if '%' in label:
+                    digits = label.translate(_KEEP_DIGITS)
+                    if digits.isdigit():
+                        discount = int(digits)
+                    elif digits:
+                        # Non-latin-1 leftovers survive the deletion
+                        # table; take the first digit run instead of
+                        # letting int() blow up the site's results
+                        match = _DIGITS_RE.search(digits)
+                        discount = int(match.group()) if match else None
+
+            products.append({
+                'site': 'flipkart',
+                'title': title,
+                'price': self.normalize_price(_text(prices[0])) if prices else None,
+                'currency': 'INR',
+                'discount_percent': discount,
+                'url': f"{self.BASE_URL}{links[0]}" if links else None,
+                'image_url': images[0] if images else None,
+            })
+            if len(products) >= max_results:
+                break
+        return products
+
+class ScraperManager:
+    """Coordinates the per-site scrapers."""
+
+    def __init__(self):
+        # Classes, not instances: each search gets its own scraper (and
+        # aiohttp session). Sharing one instance races overlapping
+        # searches — __aexit__ closes the session under whichever call
+        # is still in flight. Per-domain pacing is unaffected because
+        # the token buckets live on the BaseScraper class.
+        self.scrapers: Dict[str, type] = {
+            'amazon': AmazonScraper,
+            'flipkart': FlipkartScraper,
+        }
+
+    async def search_products(
+        self,
+        query: str,
+        max_results: int = 10,
+        sites: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search every requested site concurrently.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of products per site
+            sites: Sites to search (defaults to all configured scrapers)
+
+        Returns:
+            Dict mapping site name to its product list
+        """
+        selected = [s for s in (sites or list(self.scrapers)) if s in self.scrapers]
+
+        async def run(site: str) -> List[Dict[str, Any]]:
+            scraper = self.scrapers[site]()
+            try:
+                async with scraper:
+                    return await scraper.search_products(query, max_results)
+            except Exception as e:
+                logger.error(f"{site} search failed: {str(e)}")
+                return []
+
+        results = await asyncio.gather(*(run(site) for site in selected))
+        return dict(zip(selected, results))
+
+# Global instance to be used by the application
+scraper_manager: Optional[ScraperManager] = None
+
+def get_scraper_manager() -> ScraperManager:
+    """Dependency to get the scraper manager"""
+    global scraper_manager
+    if scraper_manager is None:
+        scraper_manager = ScraperManager()
+    return scraper_manager
@@ -1,7 +1,23 @@
 # This file makes the services directory a Python package
-from .ebay_service import EBayService
+#
+# Service classes are re-exported lazily via PEP 562 module __getattr__
+# so that importing the package (or a sibling service) doesn't pay the
+# construction cost of services a worker never uses.
+#
+# The singletons are deliberately NOT package attributes: they would
+# share names with the ebay_service/amazon_service submodules, and as
+# soon as anything imports from those modules the import machinery
+# binds the module onto the package, shadowing the singleton. Use
+# get_ebay_service()/get_amazon_service() from the submodules instead.
 
-# Create eBay service instance
-ebay_service = EBayService()
+__all__ = ['EBayService', 'AmazonPAAPI']
 
-__all__ = ['EBayService', 'ebay_service']
+
+def __getattr__(name):
+    if name == 'EBayService':
+        from .ebay_service import EBayService
+        return EBayService
+    if name == 'AmazonPAAPI':
+        from .amazon_service import AmazonPAAPI
+        return AmazonPAAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
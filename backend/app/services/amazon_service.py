@@ -0,0 +1,325 @@
+import logging
+import time
+import hashlib
+import hmac
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Sequence
+import aiohttp
+import orjson
+from fastapi import HTTPException, status
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def _dig(d: Any, *keys: Any, default: Any = None) -> Any:
+    """Walk a nested dict/list path, returning default on any missing step.
+
+    A straight subscript chain under try/except is faster in CPython than
+    chained .get(..., {}) calls and avoids allocating throwaway empty dicts
+    for every miss.
+    """
+    try:
+        for key in keys:
+            d = d[key]
+        return d
+    except (KeyError, IndexError, TypeError):
+        return default
+
+@dataclass(slots=True)
+class AmazonProduct:
+    """A product returned by the Amazon Product Advertising API"""
+    asin: str
+    title: str
+    url: Optional[str] = None
+    image_url: Optional[str] = None
+    price: Optional[float] = None
+    currency: str = "USD"
+    # Empty tuples instead of None so to_dict needs no `or []` fallback
+    # (which would allocate a fresh list per product per serialization)
+    features: Sequence[str] = ()
+    offers: Sequence[Dict[str, Any]] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the product to a plain dict for API responses"""
+        return {
+            "asin": self.asin,
+            "title": self.title,
+            "url": self.url,
+            "image_url": self.image_url,
+            "price": self.price,
+            "currency": self.currency,
+            "features": self.features,
+            "offers": self.offers,
+            # time.strftime over gmtime avoids building a datetime object
+            # per product and sidesteps the utcnow() deprecation in 3.12
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }
+
+class AmazonPAAPI:
+    """Client for the Amazon Product Advertising API (PA-API v5)"""
+
+    # Constant payload fragments, built once instead of per call
+    _RESOURCES = (
+        "Images.Primary.Medium",
+        "ItemInfo.Title",
+        "ItemInfo.Features",
+        "Offers.Listings.Price"
+    )
+
+    def __init__(self):
+        self.access_key = settings.AMAZON_ACCESS_KEY
+        self.secret_key = settings.AMAZON_SECRET_KEY
+        self.partner_tag = settings.AMAZON_PARTNER_TAG
+        self.host = settings.AMAZON_HOST
+        self.region = settings.AMAZON_REGION
+        self.uri = "/paapi5/searchitems"
+        self.service = "ProductAdvertisingAPI"
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # GetItems batching knobs (PA-API accepts up to 10 ItemIds per call)
+        self.max_batch = 10
+        self.max_wait_ms = 20
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+
+        # Shared base payload; per-request payloads are built by merging
+        # on top of it so the partner fields and Resources list are never
+        # re-allocated per call
+        self._base_payload = {
+            "PartnerTag": self.partner_tag,
+            "PartnerType": "Associates",
+            "Resources": self._RESOURCES
+        }
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the shared aiohttp session for connection pooling"""
+        if self._session is None or self._session.closed:
+            # Keep-alive pooling so repeated HTTPS calls to
+            # webservices.amazon.* reuse TCP+TLS connections
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, limit_per_host=16),
+                timeout=aiohttp.ClientTimeout(total=settings.AMAZON_API_TIMEOUT)
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            self._session = None
+
+    def _sign(self, key: bytes, msg: str) -> bytes:
+        return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+
+    def _get_signature_key(self, date_stamp: str) -> bytes:
+        k_date = self._sign(f"AWS4{self.secret_key}".encode('utf-8'), date_stamp)
+        k_region = self._sign(k_date, self.region)
+        k_service = self._sign(k_region, self.service)
+        return self._sign(k_service, "aws4_request")
+
+    def _get_amazon_headers(self, payload: bytes, target: str) -> Dict[str, str]:
+        """Build the SigV4-signed headers for a PA-API request"""
+        # Single gmtime() call keeps amz_date and date_stamp consistent
+        # across day boundaries and avoids two datetime allocations
+        now = time.gmtime()
+        amz_date = time.strftime('%Y%m%dT%H%M%SZ', now)
+        date_stamp = time.strftime('%Y%m%d', now)
+
+        # Every piece is ASCII, so assemble the canonical request as bytes
+        # and hash it without a UTF-8 recode pass
+        payload_hash = hashlib.sha256(payload).hexdigest()
+        signed_headers = "host;x-amz-date"
+        canonical_request = (
+            b'POST\n' + self.uri.encode() + b'\n\n'
+            b'host:' + self.host.encode() + b'\n'
+            b'x-amz-date:' + amz_date.encode() + b'\n\n'
+            b'host;x-amz-date\n' + payload_hash.encode()
+        )
+
+        credential_scope = f"{date_stamp}/{self.region}/{self.service}/aws4_request"
+        string_to_sign = (
+            f"AWS4-HMAC-SHA256\n{amz_date}\n{credential_scope}\n"
+            f"{hashlib.sha256(canonical_request).hexdigest()}"
+        )
+
+        signing_key = self._get_signature_key(date_stamp)
+        signature = hmac.new(
+            signing_key, string_to_sign.encode('utf-8'), hashlib.sha256
+        ).hexdigest()
+
+        authorization = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{credential_scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}"
+        )
+
+        return {
+            "Content-Type": "application/json; charset=utf-8",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Target": target,
+            "Content-Encoding": "amz-1.0",
+            "Authorization": authorization
+        }
+
+    async def _make_request(self, operation: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make a signed request to the PA-API without blocking the event loop
+
+        Args:
+            operation: PA-API operation name (SearchItems or GetItems)
+            payload: Request payload dict
+
+        Returns:
+            Dict containing the JSON response from the API
+
+        Raises:
+            HTTPException: If the request fails or the API returns an error
+        """
+        url = f"https://{self.host}{self.uri}"
+        target = f"com.amazon.paapi5.v1.ProductAdvertisingAPIv1.{operation}"
+        payload_json = orjson.dumps(payload)
+        headers = self._get_amazon_headers(payload_json, target)
+
+        session = self._get_session()
+        try:
+            async with session.post(url, headers=headers, data=payload_json) as response:
+                logger.debug(f"Amazon PA-API Response [{operation}]: {response.status}")
+                if response.status >= 400:
+                    detail = await response.text()
+                    logger.error(f"Amazon PA-API error ({response.status}): {detail[:500]}")
+                    raise HTTPException(
+                        status_code=response.status,
+                        detail={
+                            "error": "amazon_api_error",
+                            "message": f"Amazon PA-API request failed for {operation}"
+                        }
+                    )
+                data = orjson.loads(await response.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Amazon PA-API request failed [{operation}]: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "error": "service_unavailable",
+                    "message": "Failed to connect to Amazon PA-API. Please try again later."
+                }
+            )
+
+        return data
+
+    def _parse_search_items(self, data: Dict[str, Any]) -> List[AmazonProduct]:
+        """Parse a SearchItems response into AmazonProduct objects"""
+        return self._parse_items(_dig(data, 'SearchResult', 'Items', default=[]))
+
+    def _parse_get_items(self, data: Dict[str, Any]) -> List[AmazonProduct]:
+        """Parse a GetItems response into AmazonProduct objects"""
+        return self._parse_items(_dig(data, 'ItemsResult', 'Items', default=[]))
+
+    def _parse_items(self, items: List[Dict[str, Any]]) -> List[AmazonProduct]:
+        """Build AmazonProduct objects from a PA-API Items list"""
+        products = []
+        for item in items:
+            listing = _dig(item, 'Offers', 'Listings', default=())
+            products.append(AmazonProduct(
+                asin=item.get('ASIN', ''),
+                title=_dig(item, 'ItemInfo', 'Title', 'DisplayValue', default='No title'),
+                url=item.get('DetailPageURL'),
+                image_url=_dig(item, 'Images', 'Primary', 'Medium', 'URL'),
+                price=_dig(listing, 0, 'Price', 'Amount'),
+                currency=_dig(listing, 0, 'Price', 'Currency', default='USD'),
+                features=_dig(item, 'ItemInfo', 'Features', 'DisplayValues', default=()),
+                offers=listing
+            ))
+        return products
+
+    async def search_products(self, keywords: str, item_count: int = 10) -> List[AmazonProduct]:
+        """
+        Search for products on Amazon
+
+        Args:
+            keywords: Search keywords
+            item_count: Maximum number of items to return (PA-API max is 10)
+
+        Returns:
+            List of AmazonProduct objects
+        """
+        payload = {
+            **self._base_payload,
+            "Keywords": keywords,
+            "ItemCount": min(item_count, 10)
+        }
+        data = await self._make_request("SearchItems", payload)
+        return self._parse_search_items(data)
+
+    async def get_product(self, asin: str) -> Optional[AmazonProduct]:
+        """
+        Get detailed information about a specific product by ASIN.
+
+        Concurrent calls within a short window are coalesced into a single
+        batched GetItems request (PA-API accepts up to 10 ItemIds per call),
+        so N concurrent lookups cost one round trip instead of N.
+        """
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((asin, future))
+
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_task = asyncio.create_task(self._batch_worker())
+
+        return await future
+
+    async def _batch_worker(self):
+        """Drain queued ASINs into batched GetItems requests"""
+        while True:
+            try:
+                asin, future = await asyncio.wait_for(
+                    self._batch_queue.get(), timeout=1.0
+                )
+            except asyncio.TimeoutError:
+                # No pending lookups; let the task exit and be respawned on demand
+                return
+
+            batch = [(asin, future)]
+            deadline = asyncio.get_running_loop().time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(
+                        self._batch_queue.get(), timeout=remaining
+                    ))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._resolve_batch(batch)
+
+    async def _resolve_batch(self, batch):
+        """Run one GetItems request for a batch and resolve each caller's future"""
+        asins = [asin for asin, _ in batch]
+        payload = {**self._base_payload, "ItemIds": asins}
+
+        try:
+            data = await self._make_request("GetItems", payload)
+            products = self._parse_get_items(data)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_asin = {product.asin: product for product in products}
+        for asin, future in batch:
+            if not future.done():
+                future.set_result(by_asin.get(asin))
+
+# Global instance to be used by the application
+amazon_service: Optional[AmazonPAAPI] = None
+
+def get_amazon_service() -> AmazonPAAPI:
+    """Dependency to get the Amazon PA-API service"""
+    global amazon_service
+    if amazon_service is None:
+        amazon_service = AmazonPAAPI()
+    return amazon_service
@@ -1,7 +1,10 @@
 import logging
+import random
+import secrets
 import time
 import json
 import asyncio
+import orjson
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 import httpx
@@ -12,9 +15,36 @@ from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+def _filters_key(filters: Optional[Dict[str, Any]]) -> str:
+    """Stable serialization of search filters for cache/coalescing keys.
+
+    Key-sorted so two dicts with the same content always render the same
+    string; empty and None collapse to "" so unfiltered searches keep
+    their old key shape.
+    """
+    if not filters:
+        return ""
+    return orjson.dumps(filters, option=orjson.OPT_SORT_KEYS).decode()
+
+# Counts a call in the current window and reads the previous window's
+# count in one atomic round trip. EXPIRE is only issued when the counter
+# is first created, which also closes the race where a TTL check runs
+# after another client's key expiry.
+_COUNT_CALL_LUA = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+local previous = redis.call('GET', KEYS[2])
+if not previous then
+    previous = 0
+end
+return {current, previous}
+"""
+
 class RateLimiter:
     """Rate limiter for eBay API calls"""
-    
+
     def __init__(self, max_calls: int = 5000, period: int = 86400):
         """
         Initialize the rate limiter
@@ -27,116 +57,81 @@ class RateLimiter:
         self.period = period
         self.redis = get_redis_client()
         self.redis_available = self.redis is not None
+        self._count_script = (
+            self.redis.register_script(_COUNT_CALL_LUA) if self.redis is not None else None
+        )
         self.lock = asyncio.Lock()
         self._local_usage = 0
-        self._local_reset = time.time() + period
-    
-    async def _get_usage(self) -> Tuple[int, float]:
-        """Get the current usage and reset time"""
-        now = time.time()
-        
-        # If Redis is not available, use local counter
-        if not self.redis_available:
-            if now > self._local_reset:
-                self._local_usage = 0
-                self._local_reset = now + self.period
-            return self._local_usage, self._local_reset
-            
-        # Use Redis if available
-        async with self.lock:
-            try:
-                usage_key = "ebay:rate_limit:usage"
-                reset_key = "ebay:rate_limit:reset_time"
-                
-                # Get current values from Redis
-                usage = int(self.redis.get(usage_key) or 0)
-                reset_time = float(self.redis.get(reset_key) or now + self.period)
-                
-                # Reset counter if period has passed
-                if now > reset_time:
-                    usage = 0
-                    reset_time = now + self.period
-                    try:
-                        self.redis.set(usage_key, usage, ex=int(self.period))
-                        self.redis.set(reset_key, reset_time, ex=int(self.period))
-                    except Exception as e:
-                        logger.warning(f"Failed to update Redis rate limit: {str(e)}")
-                        self.redis_available = False
-                        return await self._get_usage()  # Fall back to local counter
-                
-                return usage, reset_time
-            except Exception as e:
-                logger.warning(f"Failed to get rate limit from Redis: {str(e)}")
-                self.redis_available = False
-                return await self._get_usage()  # Fall back to local counter
+        self._local_reset = time.monotonic() + period
     
-    async def _increment_usage(self):
-        """Increment the usage counter"""
-        # Update local counter if Redis is not available
-        if not self.redis_available:
-            self._local_usage += 1
-            return
-            
-        # Otherwise update Redis
-        async with self.lock:
-            try:
-                usage_key = "ebay:rate_limit:usage"
-                self.redis.incr(usage_key)
-            except Exception as e:
-                logger.warning(f"Failed to increment rate limit counter: {str(e)}")
-                self.redis_available = False
-                self._local_usage += 1  # Fall back to local counter
-            if self.redis.ttl(usage_key) == -1:
-                self.redis.expire(usage_key, self.period)
-    
-    async def wait_if_needed(self):
-        """Wait if we're approaching the rate limit"""
-        usage, reset_time = await self._get_usage()
+    async def _count_call(self) -> Optional[Tuple[float, float]]:
+        """Record one call in Redis and return (effective_usage, reset_time).
+
+        Uses a two-bucket weighted sliding window: the previous window's
+        count is weighted by how much of it still overlaps the trailing
+        period. A plain fixed window lets callers burst 2x the quota at
+        the window boundary; the weighted estimate prevents that while
+        still costing one pipelined round trip per call (INCR is atomic
+        server-side, so there is no read-modify-write race between
+        workers the way the old GET/SET sequence had).
+
+        Returns None when Redis fails, flipping the limiter into its
+        local fallback mode.
+        """
         now = time.time()
-        
-        # Check if we've exceeded the limit
-        if usage >= self.max_calls:
-            sleep_time = reset_time - now
-            if sleep_time > 0:
-                logger.warning(f"Rate limit reached. Waiting {sleep_time:.2f} seconds until reset.")
-                await asyncio.sleep(sleep_time)
-                # Reset usage after waiting
-                await self._get_usage()
-        
-        # Calculate delay to stay under rate limit
-        time_since_last = now - self._get_last_request_time()
-        min_interval = 1.0 / (self.max_calls / (self.period * 0.9))  # 90% of limit for safety
-        
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            await asyncio.sleep(sleep_time)
-        
-        # Update last request time
-        self._update_last_request_time()
-        
-        # Increment usage counter
-        await self._increment_usage()
-    
-    def _get_last_request_time(self) -> float:
-        """Get the timestamp of the last request"""
-        if not self.redis_available:
-            return 0
-        try:
-            return float(self.redis.get("ebay:last_request_time") or 0)
-        except Exception as e:
-            logger.warning(f"Failed to get last request time from Redis: {str(e)}")
-            self.redis_available = False
-            return 0
-    
-    def _update_last_request_time(self):
-        """Update the timestamp of the last request"""
-        if not self.redis_available:
-            return
+
         try:
-            self.redis.set("ebay:last_request_time", time.time())
+            window = int(now // self.period)
+            current_key = f"ebay:rate_limit:{window}"
+            previous_key = f"ebay:rate_limit:{window - 1}"
+            # One atomic script call; the 2x TTL keeps the counter around
+            # long enough to serve as the "previous" bucket of the next
+            # window
+            current, previous = self._count_script(
+                keys=[current_key, previous_key],
+                args=[int(self.period * 2)]
+            )
+
+            elapsed_fraction = (now % self.period) / self.period
+            effective = int(previous) * (1 - elapsed_fraction) + int(current)
+            reset_time = (window + 1) * self.period
+            return effective, reset_time
         except Exception as e:
-            logger.warning(f"Failed to update last request time in Redis: {str(e)}")
+            logger.warning(f"Failed to update rate limit in Redis: {str(e)}")
             self.redis_available = False
+            return None  # Caller falls back to the local counter
+
+    async def wait_if_needed(self):
+        """Wait if we're approaching the rate limit.
+
+        The lock only guards the Redis check-and-count step; sleeping
+        happens outside it so one coroutine waiting out the window
+        doesn't serialise every other caller behind it. The local
+        fallback path is lock-free: it runs between awaits, so the
+        event loop can't interleave another coroutine mid-update.
+        """
+        while True:
+            if not self.redis_available:
+                now = time.monotonic()
+                if now > self._local_reset:
+                    self._local_usage = 0
+                    self._local_reset = now + self.period
+                if self._local_usage < self.max_calls:
+                    self._local_usage += 1
+                    return
+                sleep_time = max(self._local_reset - now, 0)
+            else:
+                async with self.lock:
+                    counted = await self._count_call()
+                if counted is None:
+                    continue  # Redis just failed; retry on the local path
+                usage, reset_time = counted
+                if usage <= self.max_calls:
+                    return
+                sleep_time = max(reset_time - time.time(), 0)
+
+            logger.warning(f"Rate limit reached. Waiting {sleep_time:.2f} seconds until reset.")
+            await asyncio.sleep(sleep_time)
 
 
 class EBayService:
@@ -150,7 +145,42 @@ class EBayService:
             max_calls=settings.EBAY_MAX_CALLS_PER_DAY,
             period=86400  # 24 hours
         )
-    
+        # One pooled client for the service's lifetime: per-request
+        # AsyncClient construction paid a fresh TCP+TLS handshake on
+        # every eBay call
+        self._client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(settings.EBAY_API_TIMEOUT, connect=10.0)
+        )
+        # In-flight request map for singleflight coalescing
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Static headers built once; only Authorization changes per call
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "X-EBAY-C-MARKETPLACE-ID": "EBAY-US",  # Default to US marketplace
+            "X-EBAY-C-ENDUSERCTX": "contextualLocation=country=<US>,zip=<10001>"
+        }
+
+    async def _singleflight(self, key: str, coro_factory) -> Any:
+        """Coalesce concurrent identical lookups onto one in-flight task.
+
+        A burst of callers asking for the same query before the first
+        response lands would each pay rate-limiter bookkeeping and an
+        eBay round trip; instead they all await the first caller's task.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(coro_factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await task
+
+    async def aclose(self):
+        """Close the pooled HTTP client (application shutdown)"""
+        await self._client.aclose()
+
+
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
         Make an authenticated request to the eBay API with rate limiting
@@ -172,83 +202,94 @@ class EBayService:
         # Get OAuth token
         token = await get_token_manager().get_access_token()
         
-        # Prepare headers
-        headers = kwargs.pop('headers', {})
-        headers.update({
+        # Overlay the per-call Authorization (and any caller headers) on
+        # the static base built at init
+        headers = {
+            **self._base_headers,
             "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-            "X-EBAY-C-MARKETPLACE-ID": "EBAY-US",  # Default to US marketplace
-            "X-EBAY-C-ENDUSERCTX": "contextualLocation=country=<US>,zip=<10001>"
-        })
-        
-        # Build the full URL
-        url = f"{self.BASE_URL}{endpoint}"
-        
-        # Add request to history for debugging
-        request_id = f"ebay_req_{int(time.time() * 1000)}"
-        logger.debug(f"eBay API Request [{request_id}]: {method} {url}")
-        
-        # Create a timeout object
-        timeout = httpx.Timeout(settings.EBAY_API_TIMEOUT, connect=10.0)
+            **kwargs.pop('headers', {})
+        }
         
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            try:
-                # Make the async request
-                response = await client.request(
+        # Random request id for log correlation; a millisecond timestamp
+        # collides for concurrent requests
+        request_id = f"ebay_req_{secrets.token_hex(6)}"
+        logger.debug(f"eBay API Request [{request_id}]: {method} {self.BASE_URL}{endpoint}")
+
+        try:
+            for attempt in range(5):
+                # Make the async request over the shared pooled client
+                response = await self._client.request(
                     method=method,
-                    url=url,
+                    url=endpoint,
                     headers=headers,
                     **kwargs
                 )
-                
+
                 # Log response status
                 logger.debug(f"eBay API Response [{request_id}]: {response.status_code}")
-                
-                # Handle rate limiting
+
+                # Handle rate limiting with bounded, jittered backoff;
+                # the old recursive retry re-ran the limiter and header
+                # build every attempt and had no upper bound
                 if response.status_code == 429:  # Too Many Requests
                     retry_after = int(response.headers.get('Retry-After', '5'))
-                    logger.warning(f"Rate limited by eBay API. Retrying after {retry_after} seconds.")
-                    await asyncio.sleep(retry_after)
-                    return await self._make_request(method, endpoint, **kwargs)
-                
+                    backoff = min(retry_after, 2 ** attempt + random.uniform(0, 0.5))
+                    logger.warning(
+                        f"Rate limited by eBay API (attempt {attempt + 1}/5). "
+                        f"Retrying in {backoff:.2f} seconds."
+                    )
+                    await asyncio.sleep(backoff)
+                    continue
+
                 # Handle other errors
                 response.raise_for_status()
-                
-                # Return JSON response
-                return response.json()
-                
-            except httpx.HTTPStatusError as e:
-                logger.error(f"eBay API request failed with status {e.response.status_code} [{request_id}]: {str(e)}")
-                
-                # Try to extract error details from the response
-                status_code = e.response.status_code
-                detail = "Failed to communicate with eBay API"
-                
-                try:
-                    error_data = e.response.json()
-                    detail = error_data.get('errors', [{}])[0].get('message', detail)
-                except (json.JSONDecodeError, AttributeError, IndexError, KeyError):
-                    detail = e.response.text or detail
-                
-                raise HTTPException(
-                    status_code=status_code,
-                    detail={
-                        "error": "ebay_api_error",
-                        "message": detail,
-                        "request_id": request_id
-                    }
-                )
-                
-            except (httpx.RequestError, httpx.TimeoutException) as e:
-                logger.error(f"eBay API request failed [{request_id}]: {str(e)}")
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail={
-                        "error": "service_unavailable",
-                        "message": "Failed to connect to eBay API. Please try again later.",
-                        "request_id": request_id
-                    }
-                )
+
+                # Parse the raw bytes with orjson; ~3-5x faster than the
+                # stdlib parser on the large search payloads
+                return orjson.loads(response.content)
+
+            # Still rate limited after every attempt
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={
+                    "error": "rate_limited",
+                    "message": "eBay API rate limit exceeded. Please try again later.",
+                    "request_id": request_id
+                }
+            )
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"eBay API request failed with status {e.response.status_code} [{request_id}]: {str(e)}")
+
+            # Try to extract error details from the response
+            status_code = e.response.status_code
+            detail = "Failed to communicate with eBay API"
+
+            try:
+                error_data = e.response.json()
+                detail = error_data.get('errors', [{}])[0].get('message', detail)
+            except (json.JSONDecodeError, AttributeError, IndexError, KeyError):
+                detail = e.response.text or detail
+
+            raise HTTPException(
+                status_code=status_code,
+                detail={
+                    "error": "ebay_api_error",
+                    "message": detail,
+                    "request_id": request_id
+                }
+            )
+
+        except (httpx.RequestError, httpx.TimeoutException) as e:
+            logger.error(f"eBay API request failed [{request_id}]: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "error": "service_unavailable",
+                    "message": "Failed to connect to eBay API. Please try again later.",
+                    "request_id": request_id
+                }
+            )
     
     async def search_products(
         self,
@@ -259,19 +300,35 @@ class EBayService:
     ) -> List[Dict[str, Any]]:
         """
         Search for products on eBay.
-        
+
         Args:
             query: Search query string
             limit: Maximum number of results to return
             offset: Pagination offset
             filters: Additional search filters
-            
+
         Returns:
             List of product items
-            
+
         Raises:
             HTTPException: If the search fails
         """
+        # Filters change the result set, so they must be part of the
+        # coalescing key or differently-filtered searches would share
+        # one in-flight task
+        return await self._singleflight(
+            f"search:{query}:{limit}:{offset}:{_filters_key(filters)}",
+            lambda: self._search_products(query, limit, offset, filters)
+        )
+
+    async def _search_products(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Perform an uncoalesced product search"""
         logger.info("[EBAY] Starting product search for query: %s", query)
         logger.debug("[EBAY] Search params - limit: %d, offset: %d", limit, offset)
         
@@ -284,14 +341,15 @@ class EBayService:
             logger.error(f"Failed to get access token: {str(e)}")
             raise
         
-        # Only use Redis if it's available
+        # Only use Redis if it's available; the filters are part of the
+        # cache key for the same reason they're in the coalescing key
+        cache_key = f"ebay:search:{query}:{limit}:{offset}:{_filters_key(filters)}"
         if self.redis is not None:
             try:
-                cache_key = f"ebay:search:{query}:{limit}:{offset}"
                 # Try to get from cache first
                 cached = self.redis.get(cache_key)
                 if cached:
-                    return json.loads(cached)
+                    return orjson.loads(cached)
             except Exception as e:
                 logger.warning(f"Failed to read from Redis cache: {str(e)}")
         
@@ -335,8 +393,7 @@ class EBayService:
         # Cache for 1 hour if Redis is available
         if self.redis is not None:
             try:
-                cache_key = f"ebay:search:{query}:{limit}:{offset}"
-                self.redis.setex(cache_key, 3600, json.dumps(result))
+                self.redis.setex(cache_key, 3600, orjson.dumps(result))
             except Exception as e:
                 logger.warning(f"Failed to write to Redis cache: {str(e)}")
         
@@ -344,22 +401,34 @@ class EBayService:
     
     async def get_product(self, item_id: str) -> Dict[str, Any]:
         """Get detailed information about a specific product"""
+        return await self._singleflight(
+            f"product:{item_id}",
+            lambda: self._get_product(item_id)
+        )
+
+    async def _get_product(self, item_id: str) -> Dict[str, Any]:
+        """Perform an uncoalesced product lookup"""
+        cache_key = f"ebay:product:{item_id}"
+
         # Only use Redis if it's available
         if self.redis is not None:
             try:
-                cache_key = f"ebay:product:{item_id}"
                 # Try to get from cache first
                 cached = self.redis.get(cache_key)
                 if cached:
-                    return json.loads(cached)
+                    return orjson.loads(cached)
             except Exception as e:
                 logger.warning(f"Failed to read from Redis cache: {str(e)}")
-        
+
         result = await self._make_request("GET", f"/item/{item_id}?fieldgroups=COMPACT")
-        
-        # Cache for 1 day
-        self.redis.setex(cache_key, 86400, json.dumps(result))
-        
+
+        # Cache for 1 day if Redis is available
+        if self.redis is not None:
+            try:
+                self.redis.setex(cache_key, 86400, orjson.dumps(result))
+            except Exception as e:
+                logger.warning(f"Failed to write to Redis cache: {str(e)}")
+
         return result
 
 # Global instance to be used by the application
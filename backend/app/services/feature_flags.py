@@ -4,8 +4,10 @@ Feature Flags Service
 This module provides a centralized way to manage feature flags for the application.
 Feature flags allow enabling/disabling features without code deployment.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+import asyncio
 import logging
+import time
 from fastapi import HTTPException, status
 from ..core.redis_client import get_redis_client
 from ..core.config import settings
@@ -24,7 +26,10 @@ class FeatureFlags:
     
     def __init__(self):
         self.redis = get_redis_client()
-        self.prefix = "feature_flag:"
+        # All flags live in one hash per scope ("feature_flags" globally,
+        # "feature_flags:{user_id}" per user): small hashes get Redis's
+        # compact encoding and the whole set reads with one HGETALL
+        self.hash_key = "feature_flags"
         
         # Default values for all feature flags
         self.default_flags = {
@@ -36,7 +41,69 @@ class FeatureFlags:
             "enable_telemetry": False,
             "maintenance_mode": False,
         }
-    
+
+        # In-process cache: handlers check flags per request, and a short
+        # TTL turns those lookups into dict hits instead of Redis round
+        # trips. set_flag publishes on this channel so other workers drop
+        # their cached entry instead of serving it for the full TTL.
+        self._local: Dict[str, Tuple[bool, float]] = {}
+        self._local_ttl = 5.0
+        self._channel = "feature_flag_updates"
+        self._listener_task: Optional[asyncio.Task] = None
+        self._listener_retry_delay = 30.0
+        self._listener_retry_at = 0.0
+
+    def _ensure_listener(self):
+        """Start the pub/sub invalidation listener if it isn't running.
+
+        Without Redis there is nothing to subscribe to, and after a
+        failed subscribe the respawn is held back for
+        _listener_retry_delay seconds — otherwise every flag check
+        would spawn a new doomed task and log a fresh error.
+        """
+        if self.redis is None:
+            return
+        if self._listener_task is not None and not self._listener_task.done():
+            return
+        now = time.monotonic()
+        if now < self._listener_retry_at:
+            return
+        self._listener_retry_at = now + self._listener_retry_delay
+        self._listener_task = asyncio.get_running_loop().create_task(
+            self._listen_for_invalidations()
+        )
+
+    async def _listen_for_invalidations(self):
+        """Drop local cache entries for flags updated by other workers"""
+        try:
+            pubsub = self.redis.pubsub()
+            pubsub.subscribe(self._channel)
+        except Exception as e:
+            logger.error(f"Failed to subscribe to flag updates: {str(e)}")
+            return
+
+        while True:
+            try:
+                # The redis client is synchronous, so poll in a worker thread
+                message = await asyncio.to_thread(
+                    pubsub.get_message, ignore_subscribe_messages=True, timeout=1.0
+                )
+            except Exception as e:
+                logger.error(f"Error listening for flag updates: {str(e)}")
+                await asyncio.sleep(5)
+                continue
+            if message:
+                data = message.get('data')
+                flag_name = data.decode() if isinstance(data, bytes) else str(data)
+                self._invalidate_local(flag_name)
+
+    def _invalidate_local(self, flag_name: str):
+        """Drop the cached global and user-scoped entries for a flag"""
+        user_prefix = f"{flag_name}:"
+        for key in [k for k in self._local if k == flag_name or k.startswith(user_prefix)]:
+            self._local.pop(key, None)
+
+
     async def is_enabled(self, flag_name: str, user_id: Optional[str] = None) -> bool:
         """
         Check if a feature flag is enabled.
@@ -55,20 +122,30 @@ class FeatureFlags:
         if flag_name not in self.default_flags:
             logger.warning(f"Unknown feature flag: {flag_name}")
             return False
-        
+
+        self._ensure_listener()
+
+        # Serve from the in-process cache when fresh
+        cache_key = f"{flag_name}:{user_id}" if user_id else flag_name
+        entry = self._local.get(cache_key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
         # Check for user-specific flag first
+        value = None
         if user_id:
-            user_flag = await self._get_redis_flag(f"{flag_name}:{user_id}")
-            if user_flag is not None:
-                return user_flag
-        
+            value = await self._get_redis_flag(flag_name, user_id)
+
         # Check for global flag
-        redis_flag = await self._get_redis_flag(flag_name)
-        if redis_flag is not None:
-            return redis_flag
-        
+        if value is None:
+            value = await self._get_redis_flag(flag_name)
+
         # Fall back to environment/default value
-        return self.default_flags[flag_name]
+        if value is None:
+            value = self.default_flags[flag_name]
+
+        self._local[cache_key] = (value, time.monotonic() + self._local_ttl)
+        return value
     
     async def set_flag(self, flag_name: str, value: bool, user_id: Optional[str] = None) -> None:
         """
@@ -89,13 +166,13 @@ class FeatureFlags:
             )
         
         try:
-            key = f"{self.prefix}{flag_name}"
-            if user_id:
-                key = f"{key}:{user_id}"
-            
-            self.redis.set(key, "1" if value else "0")
+            key = f"{self.hash_key}:{user_id}" if user_id else self.hash_key
+            self.redis.hset(key, flag_name, "1" if value else "0")
+            # Tell every worker (including this one) to drop its cached copy
+            self.redis.publish(self._channel, flag_name)
+            self._invalidate_local(flag_name)
             logger.info(f"Set feature flag {key} to {value}")
-            
+
         except Exception as e:
             logger.error(f"Failed to set feature flag {flag_name}: {str(e)}")
             raise HTTPException(
@@ -103,12 +180,15 @@ class FeatureFlags:
                 detail="Failed to update feature flag"
             )
     
-    async def _get_redis_flag(self, flag_name: str) -> Optional[bool]:
-        """Get a feature flag value from Redis"""
+    async def _get_redis_flag(self, flag_name: str, user_id: Optional[str] = None) -> Optional[bool]:
+        """Get a feature flag value from the scope's Redis hash"""
         try:
-            value = self.redis.get(f"{self.prefix}{flag_name}")
+            key = f"{self.hash_key}:{user_id}" if user_id else self.hash_key
+            value = self.redis.hget(key, flag_name)
             if value is not None:
-                return value == b"1"
+                # decode_responses=True on the shared client, so the
+                # stored "1"/"0" comes back as str
+                return value == "1"
             return None
         except Exception as e:
             logger.error(f"Error reading feature flag {flag_name}: {str(e)}")
@@ -124,9 +204,27 @@ class FeatureFlags:
         Returns:
             Dict of flag names to their current values
         """
+        # One pipelined HGETALL per scope instead of 2 GETs per flag
+        try:
+            pipe = self.redis.pipeline()
+            if user_id:
+                pipe.hgetall(f"{self.hash_key}:{user_id}")
+            pipe.hgetall(self.hash_key)
+            scopes = pipe.execute()
+        except Exception as e:
+            logger.error(f"Error reading feature flags: {str(e)}")
+            return dict(self.default_flags)
+
+        user_hash = scopes[0] if user_id else {}
+        global_hash = scopes[-1]
+
         result = {}
-        for flag_name in self.default_flags:
-            result[flag_name] = await self.is_enabled(flag_name, user_id)
+        for name, default in self.default_flags.items():
+            # Precedence: user-specific > global > environment/default.
+            # The shared client decodes responses, so fields and values
+            # come back as str
+            value = user_hash.get(name, global_hash.get(name))
+            result[name] = value == "1" if value is not None else default
         return result
 
 # Global instance
@@ -1,6 +1,10 @@
+import asyncio
+import hashlib
 import logging
-import requests
+import httpx
+import orjson
 from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from fastapi import HTTPException, status
 from ..core.config import settings
 from ..core.redis_client import get_redis_client
@@ -15,6 +19,53 @@ class SafeBrowsingService:
         self.api_url = "https://safebrowsing.googleapis.com/v4/threatMatches:find"
         self.redis = get_redis_client()
         self.cache_ttl = 86400  # 24 hours
+        # Shared pooled client so concurrent checks reuse connections and
+        # don't block the event loop the way requests.post did
+        self._client = httpx.AsyncClient(
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=10)
+        )
+        # In-flight request map for singleflight coalescing
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Canonicalize a URL so equivalent variants share one cache entry.
+
+        Lowercases the scheme and host, drops utm_* tracking params and
+        the fragment, sorts the remaining query params, and strips a
+        trailing slash. Clients pass the same logical URL in many
+        spellings, and every spelling that misses the cache costs an
+        API round trip.
+        """
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return url
+
+        query = urlencode(sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith('utm_')
+        ))
+        path = parts.path
+        if path.endswith('/') and path != '/':
+            path = path.rstrip('/')
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        """Build a compact cache key for a URL.
+
+        URLs with query strings can run to kilobytes; a 16-byte blake2b
+        digest keeps every key at 32 hex chars, which is far cheaper in
+        Redis memory and keyspace scans at this cardinality.
+        """
+        return f"sb:{hashlib.blake2b(url.encode(), digest_size=16).hexdigest()}"
+
+    async def aclose(self):
+        """Close the pooled HTTP client (application shutdown)"""
+        await self._client.aclose()
     
     async def is_url_safe(self, url: str) -> bool:
         """
@@ -26,15 +77,29 @@ class SafeBrowsingService:
         Returns:
             bool: True if the URL is safe, False if it's flagged as malicious
         """
+        # Coalesce concurrent checks of the same URL onto one lookup
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._check_url(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await task
+
+    async def _check_url(self, url: str) -> bool:
+        """Perform an uncoalesced safety check"""
         if not self.api_key:
             logger.warning("Google Safe Browsing API key not configured")
             return True  # Assume safe if not configured
-        
+
+        # Canonicalize so URL spelling variants hit the same cache entry
+        url = self._normalize_url(url)
+
         # Check cache first
-        cache_key = f"safe_browsing:{url}"
+        cache_key = self._cache_key(url)
         cached = self.redis.get(cache_key)
         if cached is not None:
-            return cached.decode().lower() == 'true'
+            # The client decodes responses, so values come back as str
+            return cached == 'true'
         
         # Prepare the request payload
         payload = {
@@ -56,23 +121,23 @@ class SafeBrowsingService:
         }
         
         try:
-            response = requests.post(
-                f"{self.api_url}?key={self.api_key}",
-                json=payload,
-                timeout=5
+            response = await self._client.post(
+                self.api_url,
+                params={"key": self.api_key},
+                json=payload
             )
             response.raise_for_status()
-            
+
             # If there are matches, the URL is not safe
-            result = response.json()
+            result = orjson.loads(response.content)
             is_safe = not bool(result.get("matches", []))
-            
+
             # Cache the result
             self.redis.setex(cache_key, self.cache_ttl, str(is_safe).lower())
-            
+
             return is_safe
-            
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             logger.error(f"Safe Browsing API error: {str(e)}")
             # In case of error, assume the URL is safe to avoid blocking content
             return True
@@ -80,6 +145,105 @@ class SafeBrowsingService:
             logger.error(f"Error checking URL safety: {str(e)}")
             return True
 
+    async def are_urls_safe(self, urls: List[str]) -> Dict[str, bool]:
+        """
+        Check many URLs in bulk.
+
+        The Safe Browsing v4 API accepts up to 500 threatEntries per call,
+        so K uncached URLs cost one round trip instead of K. The cache is
+        consulted with a single MGET and updated through one pipeline.
+
+        Args:
+            urls: The URLs to check
+
+        Returns:
+            Dict mapping each URL to True if safe, False if flagged
+        """
+        if not self.api_key:
+            logger.warning("Google Safe Browsing API key not configured")
+            return {url: True for url in urls}
+
+        # Bulk cache check first, on canonicalized URLs. A missing or
+        # failing cache degrades to the API call, matching the
+        # assume-safe posture of every other path in this service.
+        normalized = {url: self._normalize_url(url) for url in urls}
+        results: Dict[str, bool] = {}
+        to_check: List[str] = []
+        cached_values: List[Optional[str]] = [None] * len(urls)
+        if self.redis is not None:
+            try:
+                cached_values = self.redis.mget(
+                    [self._cache_key(normalized[url]) for url in urls]
+                )
+            except Exception as e:
+                logger.warning(f"Safe Browsing cache read failed: {str(e)}")
+        for url, cached in zip(urls, cached_values):
+            if cached is not None:
+                results[url] = cached == 'true'
+            elif url not in results:
+                to_check.append(url)
+
+        unsafe = set()
+        checked: List[str] = []
+        for start in range(0, len(to_check), 500):
+            batch = to_check[start:start + 500]
+            payload = {
+                "client": {
+                    "clientId": settings.PROJECT_NAME.lower().replace(" ", "-"),
+                    "clientVersion": "1.0.0"
+                },
+                "threatInfo": {
+                    "threatTypes": [
+                        "MALWARE",
+                        "SOCIAL_ENGINEERING",
+                        "UNWANTED_SOFTWARE",
+                        "POTENTIALLY_HARMFUL_APPLICATION"
+                    ],
+                    "platformTypes": ["ANY_PLATFORM"],
+                    "threatEntryTypes": ["URL"],
+                    "threatEntries": [{"url": normalized[url]} for url in batch]
+                }
+            }
+
+            try:
+                response = await self._client.post(
+                    self.api_url,
+                    params={"key": self.api_key},
+                    json=payload
+                )
+                response.raise_for_status()
+                for match in orjson.loads(response.content).get("matches", []):
+                    matched_url = match.get("threat", {}).get("url")
+                    if matched_url:
+                        unsafe.add(matched_url)
+                checked.extend(batch)
+            except Exception as e:
+                logger.error(f"Safe Browsing API error: {str(e)}")
+                # Assume the batch is safe to avoid blocking content,
+                # but don't cache unverified results
+                for url in batch:
+                    results[url] = True
+
+        # Resolve the verified batch, then cache it in one round trip;
+        # results stand even if the cache write fails
+        if checked:
+            for url in checked:
+                results[url] = normalized[url] not in unsafe
+            if self.redis is not None:
+                try:
+                    pipe = self.redis.pipeline()
+                    for url in checked:
+                        pipe.setex(
+                            self._cache_key(normalized[url]),
+                            self.cache_ttl,
+                            str(results[url]).lower()
+                        )
+                    pipe.execute()
+                except Exception as e:
+                    logger.warning(f"Safe Browsing cache write failed: {str(e)}")
+
+        return results
+
 # Global instance to be used by the application
 safe_browsing_service: Optional[SafeBrowsingService] = None
 
@@ -1,32 +1,54 @@
+import asyncio
 import os
-import json
+import sqlite3
+import threading
 import time
 import hashlib
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Any, List, Tuple
-import aiofiles
-import aiofiles.os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Any, List
+
+import orjson
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
 class SessionManager:
-    """Manages user sessions and cookies for web scraping."""
-    
+    """Manages user sessions and cookies for web scraping.
+
+    Sessions live in a single SQLite database (WAL mode) instead of one
+    JSON file each: expiry becomes one indexed DELETE rather than a
+    directory scan with a full read per file, and saves rewrite a single
+    row instead of a whole file. Database access goes through
+    asyncio.to_thread so the event loop is never blocked.
+    """
+
     def __init__(self, session_dir: str = "sessions"):
         """Initialize the session manager.
-        
+
         Args:
-            session_dir: Directory to store session files
+            session_dir: Directory holding the session database
         """
         self.session_dir = os.path.join(os.path.dirname(__file__), "..", session_dir)
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.db_path = os.path.join(self.session_dir, "sessions.db")
+        # LRU-ordered: bounded so a long-running server doesn't accumulate
+        # every session it has ever touched
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_cached_sessions = 1024
+        self._conn: Optional[sqlite3.Connection] = None
+        # sqlite3 connections are not safe for unsynchronized cross-thread
+        # use, and to_thread may run on any pool thread
+        self._db_lock = threading.Lock()
         self._ensure_session_dir()
         self._cleanup_interval = 3600  # 1 hour
         self._last_cleanup = 0
-    
+        # Sessions with unpersisted in-memory changes, flushed periodically
+        self._dirty: set = set()
+        self._flush_interval = 5.0
+        self._flush_task = None
+
     def _ensure_session_dir(self):
         """Ensure the session directory exists."""
         try:
@@ -34,46 +56,125 @@ class SessionManager:
         except Exception as e:
             logger.error(f"Failed to create session directory: {e}")
             raise
-    
-    def _get_session_file(self, session_id: str) -> str:
-        """Get the path to a session file."""
-        return os.path.join(self.session_dir, f"{session_id}.json")
-    
+
+    def _db(self) -> sqlite3.Connection:
+        """Get the database connection, creating schema on first use."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # WAL keeps readers and the writer from blocking each other
+            # and avoids rewriting whole pages on every commit
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, blob BLOB, expires INTEGER)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _db_get(self, session_id: str) -> Optional[bytes]:
+        """Fetch an unexpired session blob (blocking)."""
+        with self._db_lock:
+            row = self._db().execute(
+                "SELECT blob FROM sessions WHERE id = ? AND expires > ?",
+                (session_id, int(time.time()))
+            ).fetchone()
+        return row[0] if row else None
+
+    def _db_put(self, session_id: str, blob: bytes, expires: int) -> None:
+        """Insert or replace a session row (blocking)."""
+        with self._db_lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (id, blob, expires) VALUES (?, ?, ?)",
+                (session_id, blob, expires)
+            )
+            conn.commit()
+
+    def _db_delete(self, session_id: str) -> None:
+        """Delete a session row (blocking)."""
+        with self._db_lock:
+            conn = self._db()
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            conn.commit()
+
+    def _db_delete_expired(self) -> int:
+        """Delete all expired rows; returns how many were removed (blocking)."""
+        with self._db_lock:
+            conn = self._db()
+            cursor = conn.execute(
+                "DELETE FROM sessions WHERE expires < ?", (int(time.time()),)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    @staticmethod
+    def _expires_epoch(session: Dict[str, Any]) -> int:
+        """Epoch timestamp for a session's 'expires' field.
+
+        New sessions store epoch ints; blobs written before that carry
+        ISO strings and get parsed once here.
+        """
+        expires = session['expires']
+        if isinstance(expires, str):
+            return int(datetime.fromisoformat(expires).timestamp())
+        return int(expires)
+
+    def _cache_get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch from the in-memory cache, refreshing LRU order."""
+        session = self.sessions.get(session_id)
+        if session is not None:
+            self.sessions.move_to_end(session_id)
+        return session
+
+    def _cache_put(self, session_id: str, session: Dict[str, Any]) -> None:
+        """Insert into the in-memory cache, evicting the oldest clean entry."""
+        self.sessions[session_id] = session
+        self.sessions.move_to_end(session_id)
+        if len(self.sessions) <= self.max_cached_sessions:
+            return
+        # Evict the least-recently-used clean entry; dirty sessions hold
+        # changes the flusher hasn't persisted yet, so skip over them
+        for candidate in list(self.sessions):
+            if candidate not in self._dirty:
+                del self.sessions[candidate]
+                break
+
     def generate_session_id(self, username: str, domain: str) -> str:
-        """Generate a unique session ID for a user and domain."""
+        """Generate a unique session ID for a user and domain.
+
+        blake2b is about twice as fast as SHA-256 on short inputs like
+        these ~50-byte keys, and a 16-byte digest is plenty of entropy
+        for an opaque ID while halving the primary-key size.
+        """
         key = f"{username}@{domain}".encode('utf-8')
-        return hashlib.sha256(key).hexdigest()
-    
+        return hashlib.blake2b(key, digest_size=16).hexdigest()
+
     async def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Load a session from disk."""
+        """Load a session from the database."""
         # Check in-memory cache first
-        if session_id in self.sessions:
-            return self.sessions[session_id]
-        
-        session_file = self._get_session_file(session_id)
-        if not os.path.exists(session_file):
-            return None
-            
+        cached = self._cache_get(session_id)
+        if cached is not None:
+            return cached
+
         try:
-            async with aiofiles.open(session_file, 'r', encoding='utf-8') as f:
-                data = await f.read()
-                session = json.loads(data)
-                
-                # Check if session is expired
-                expires = session.get('expires')
-                if expires and datetime.fromisoformat(expires) < datetime.utcnow():
-                    logger.debug(f"Session {session_id} has expired")
-                    await self.delete_session(session_id)
-                    return None
-                
-                # Cache the session
-                self.sessions[session_id] = session
-                return session
-                
+            blob = await asyncio.to_thread(self._db_get, session_id)
+            if blob is None:
+                # Missing or expired; the WHERE clause filters both
+                return None
+            session = orjson.loads(blob)
+
+            # Cache the session
+            self._cache_put(session_id, session)
+            return session
+
         except Exception as e:
             logger.error(f"Error loading session {session_id}: {e}")
             return None
-    
+
     async def save_session(
         self,
         session_id: str,
@@ -82,93 +183,129 @@ class SessionManager:
         metadata: Optional[Dict[str, Any]] = None,
         ttl: int = 86400  # 24 hours
     ) -> bool:
-        """Save a session to disk."""
+        """Save a session to the database."""
+        # Timestamps are epoch ints: written and compared without any
+        # datetime parsing, and ~a third the JSON bytes of ISO strings
+        now = int(time.time())
         session = {
             'id': session_id,
             'cookies': cookies,
             'user_agent': user_agent,
-            'created_at': datetime.utcnow().isoformat(),
-            'last_used': datetime.utcnow().isoformat(),
-            'expires': (datetime.utcnow() + timedelta(seconds=ttl)).isoformat(),
+            'created_at': now,
+            'last_used': now,
+            'expires': now + ttl,
             'metadata': metadata or {}
         }
-        
-        session_file = self._get_session_file(session_id)
-        
+
+        if not await self._write_session(session_id, session):
+            return False
+
+        # Update cache
+        self._cache_put(session_id, session)
+        self._dirty.discard(session_id)
+        return True
+
+    async def _write_session(self, session_id: str, session: Dict[str, Any]) -> bool:
+        """Persist a session dict as a single row."""
         try:
-            async with aiofiles.open(session_file, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(session, indent=2))
-            
-            # Update cache
-            self.sessions[session_id] = session
+            await asyncio.to_thread(
+                self._db_put, session_id, orjson.dumps(session),
+                self._expires_epoch(session)
+            )
             return True
-            
         except Exception as e:
             logger.error(f"Error saving session {session_id}: {e}")
             return False
-    
+
     async def delete_session(self, session_id: str) -> bool:
         """Delete a session."""
-        session_file = self._get_session_file(session_id)
-        
         try:
-            if os.path.exists(session_file):
-                await aiofiles.os.remove(session_file)
-            
+            await asyncio.to_thread(self._db_delete, session_id)
+
             # Remove from cache
             self.sessions.pop(session_id, None)
+            self._dirty.discard(session_id)
             return True
-            
+
         except Exception as e:
             logger.error(f"Error deleting session {session_id}: {e}")
             return False
-    
+
+    def _ensure_flush_task(self):
+        """Start the background dirty-session flusher if not yet running."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Periodically persist sessions with unsaved in-memory changes."""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush_dirty()
+
+    async def flush_dirty(self) -> int:
+        """Write all dirty sessions to the database; returns how many flushed."""
+        flushed = 0
+        for session_id in list(self._dirty):
+            session = self.sessions.get(session_id)
+            if session is None:
+                self._dirty.discard(session_id)
+                continue
+            if await self._write_session(session_id, session):
+                self._dirty.discard(session_id)
+                flushed += 1
+        return flushed
+
     async def update_session_usage(self, session_id: str) -> bool:
-        """Update the last used timestamp of a session."""
-        session = await self.load_session(session_id)
+        """Update the last used timestamp of a session.
+
+        Mutates the cached session and marks it dirty instead of doing a
+        load + full rewrite per scrape request; the background flusher
+        persists it within a few seconds.
+        """
+        session = self._cache_get(session_id) or await self.load_session(session_id)
         if not session:
             return False
-            
-        session['last_used'] = datetime.utcnow().isoformat()
-        return await self.save_session(
-            session_id,
-            session['cookies'],
-            session['user_agent'],
-            session['metadata']
-        )
-    
+
+        session['last_used'] = int(time.time())
+        self._dirty.add(session_id)
+        self._ensure_flush_task()
+        return True
+
     async def get_cookies_dict(self, session_id: str) -> Dict[str, str]:
         """Get cookies as a dictionary for requests."""
         session = await self.load_session(session_id)
         if not session or 'cookies' not in session:
             return {}
-            
+
         return {cookie['name']: cookie['value'] for cookie in session['cookies']}
-    
+
     async def cleanup_expired_sessions(self, force: bool = False) -> int:
-        """Clean up expired sessions."""
+        """Clean up expired sessions.
+
+        One indexed DELETE on the expires column, O(expired rows) instead
+        of a scan over every stored session.
+        """
         current_time = time.time()
         if not force and (current_time - self._last_cleanup) < self._cleanup_interval:
             return 0
-            
+
         self._last_cleanup = current_time
-        deleted = 0
-        
+
         try:
-            for filename in os.listdir(self.session_dir):
-                if not filename.endswith('.json'):
-                    continue
-                    
-                session_id = filename[:-5]  # Remove .json
-                session = await self.load_session(session_id)
-                
-                if not session:  # Session is invalid or expired
-                    await self.delete_session(session_id)
-                    deleted += 1
-                    
+            deleted = await asyncio.to_thread(self._db_delete_expired)
         except Exception as e:
             logger.error(f"Error during session cleanup: {e}")
-            
+            return 0
+
+        # Drop expired entries from the in-memory cache too
+        for session_id, session in list(self.sessions.items()):
+            try:
+                if self._expires_epoch(session) < current_time:
+                    self.sessions.pop(session_id, None)
+                    self._dirty.discard(session_id)
+            except (KeyError, ValueError):
+                continue
+
         logger.info(f"Cleaned up {deleted} expired sessions")
         return deleted
 
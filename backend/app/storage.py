@@ -1,13 +1,17 @@
-import json
+import hashlib
 import logging
 import os
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 
 import aiofiles
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, insert, and_, or_, case, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from .config import settings
 from .models import Product, PriceHistory, Base
@@ -17,16 +21,30 @@ logger = logging.getLogger(__name__)
 class StorageManager:
     """Handles data storage operations including JSON backup and database storage."""
     
-    def __init__(self, db_session: AsyncSession = None, backup_dir: str = "data/backups"):
+    def __init__(self, db_session: AsyncSession = None, backup_dir: str = "data/backups",
+                 autocommit: bool = True):
         """Initialize the storage manager.
-        
+
         Args:
             db_session: SQLAlchemy async session for database operations
             backup_dir: Directory to store JSON backups
+            autocommit: Commit after each save. Pass False when the
+                session is request-scoped (see database.get_async_db) so
+                the whole request is one transaction and one fsync;
+                saves then only flush, which keeps generated ids
+                readable before the final commit.
         """
         self.db_session = db_session
+        self.autocommit = autocommit
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        # Per (source, date): product_key -> byte offset of that key's
+        # latest JSONL line, plus the current file size so appends know
+        # their offset without a stat call
+        self._offset_index: Dict[tuple, Dict[str, int]] = {}
+        self._file_sizes: Dict[tuple, int] = {}
+        # strftime result cached until the day rolls over
+        self._today_cache: tuple = (-1, '')
     
     async def save_product(self, product_data: Dict[str, Any], source: str) -> Dict[str, Any]:
         """Save product data to both database and JSON backup.
@@ -57,73 +75,262 @@ class StorageManager:
             "json": json_result
         }
     
+    async def save_products_bulk(
+        self,
+        products: List[Dict[str, Any]],
+        source: str,
+        batch_size: int = 1000
+    ) -> Dict[str, Any]:
+        """Save many products with batched statements and one commit.
+
+        Per-row save_product costs a round trip and commit per product;
+        here each batch is one SELECT over the existing keys, one
+        executemany INSERT, one executemany UPDATE, one bulk
+        PriceHistory INSERT, and a single commit at the end.
+
+        Args:
+            products: Product dicts in save_product's format
+            source: Source website/domain for the whole batch
+            batch_size: Rows per statement batch
+
+        Returns:
+            Dictionary with save counts
+        """
+        valid = [p for p in products if p.get('url') and p.get('name')]
+        skipped = len(products) - len(valid)
+        if not valid:
+            return {"success": False, "error": "No products with required fields (url, name)"}
+
+        keys = [self._generate_product_key(p['url'], source) for p in valid]
+
+        # JSONL backups are O(1) appends, so bulk saves keep backup parity
+        for product_data, product_key in zip(valid, keys):
+            await self._save_to_json(product_data, source, product_key)
+
+        if not self.db_session:
+            return {"success": True, "saved": 0, "skipped": skipped,
+                    "error": "No database session available"}
+
+        saved = 0
+        try:
+            now = datetime.utcnow()
+            for start in range(0, len(valid), batch_size):
+                chunk = valid[start:start + batch_size]
+                chunk_keys = keys[start:start + batch_size]
+
+                result = await self.db_session.execute(
+                    select(Product.id, Product.product_key, Product.current_price,
+                           Product.name, Product.image_url, Product.brand,
+                           Product.category)
+                    .where(Product.product_key.in_(chunk_keys))
+                )
+                existing = {row.product_key: row for row in result}
+
+                to_insert: List[Dict[str, Any]] = []
+                to_update: List[Dict[str, Any]] = []
+                history_rows: List[Dict[str, Any]] = []
+                inserted_prices: Dict[str, tuple] = {}
+
+                for product_data, product_key in zip(chunk, chunk_keys):
+                    current_price = float(product_data.get('price', 0))
+                    currency = product_data.get('currency', 'USD')
+                    if product_key in existing:
+                        row = existing[product_key]
+                        product_id, old_price = row.id, row.current_price
+                        price_changed = current_price and current_price != old_price
+                        # Dirty check: daily re-crawls mostly see nothing
+                        # new, and skipping those rows avoids the row
+                        # write, WAL entry and index maintenance of a
+                        # no-op UPDATE
+                        meta_changed = (
+                            product_data['name'] != row.name
+                            or product_data.get('image_url') != row.image_url
+                            or product_data.get('brand') != row.brand
+                            or product_data.get('category') != row.category
+                        )
+                        if not price_changed and not meta_changed:
+                            continue
+                        to_update.append({
+                            "b_id": product_id,
+                            "b_name": product_data['name'],
+                            "b_image_url": product_data.get('image_url'),
+                            "b_brand": product_data.get('brand'),
+                            "b_category": product_data.get('category'),
+                            "b_price": current_price if price_changed else old_price,
+                            "b_updated_at": now
+                        })
+                        if price_changed:
+                            history_rows.append({
+                                "product_id": product_id,
+                                "price": current_price,
+                                "currency": currency
+                            })
+                    else:
+                        to_insert.append({
+                            "product_key": product_key,
+                            "url": product_data['url'],
+                            "name": product_data['name'],
+                            "source": source,
+                            "image_url": product_data.get('image_url'),
+                            "brand": product_data.get('brand'),
+                            "category": product_data.get('category'),
+                            "current_price": current_price,
+                            "currency": currency
+                        })
+                        if current_price:
+                            inserted_prices[product_key] = (current_price, currency)
+
+                if to_insert:
+                    await self.db_session.execute(insert(Product), to_insert)
+                    # Resolve ids of the fresh rows for their initial
+                    # history entries
+                    if inserted_prices:
+                        result = await self.db_session.execute(
+                            select(Product.id, Product.product_key)
+                            .where(Product.product_key.in_(list(inserted_prices)))
+                        )
+                        for row in result:
+                            price, currency = inserted_prices[row.product_key]
+                            history_rows.append({
+                                "product_id": row.id,
+                                "price": price,
+                                "currency": currency
+                            })
+
+                if to_update:
+                    # Target the Table, not the mapped class: an ORM
+                    # UPDATE with extra WHERE criteria refuses
+                    # executemany parameter lists
+                    await self.db_session.execute(
+                        update(Product.__table__)
+                        .where(Product.__table__.c.id == bindparam('b_id'))
+                        .values(
+                            name=bindparam('b_name'),
+                            image_url=bindparam('b_image_url'),
+                            brand=bindparam('b_brand'),
+                            category=bindparam('b_category'),
+                            current_price=bindparam('b_price'),
+                            updated_at=bindparam('b_updated_at')
+                        ),
+                        to_update
+                    )
+
+                if history_rows:
+                    await self.db_session.execute(insert(PriceHistory), history_rows)
+
+                saved += len(chunk)
+
+            await self._commit()
+            return {"success": True, "saved": saved, "skipped": skipped}
+
+        except Exception as e:
+            await self.db_session.rollback()
+            logger.error(f"Error bulk-saving products: {e}")
+            return {"success": False, "error": str(e), "saved": 0, "skipped": skipped}
+
+    async def _commit(self) -> None:
+        """Commit if this manager owns the transaction, else just flush."""
+        if self.autocommit:
+            await self.db_session.commit()
+        else:
+            await self.db_session.flush()
+
     async def _save_to_database(self, product_data: Dict[str, Any], source: str, product_key: str) -> Dict[str, Any]:
         """Save product data to the database."""
         if not self.db_session:
             return {"success": False, "error": "No database session available"}
             
         try:
-            # Check if product exists
-            result = await self.db_session.execute(
-                select(Product).where(Product.product_key == product_key)
-            )
-            product = result.scalar_one_or_none()
-            
             current_price = float(product_data.get('price', 0))
-            
-            if product:
-                # Update existing product
-                product.name = product_data.get('name', product.name)
-                product.image_url = product_data.get('image_url', product.image_url)
-                product.brand = product_data.get('brand', product.brand)
-                product.category = product_data.get('category', product.category)
-                product.updated_at = datetime.utcnow()
-                
-                # Only update price if it has changed
-                if current_price and current_price != product.current_price:
-                    # Create price history entry
-                    price_history = PriceHistory(
-                        product_id=product.id,
-                        price=current_price,
-                        currency=product_data.get('currency', 'USD')
-                    )
-                    self.db_session.add(price_history)
-                    product.current_price = current_price
-                    
-                action = "updated"
-            else:
-                # Create new product
-                product = Product(
-                    product_key=product_key,
-                    url=product_data['url'],
-                    name=product_data['name'],
-                    source=source,
-                    image_url=product_data.get('image_url'),
-                    brand=product_data.get('brand'),
-                    category=product_data.get('category'),
-                    current_price=current_price,
-                    currency=product_data.get('currency', 'USD')
+            currency = product_data.get('currency', 'USD')
+
+            # Resolve the existing row up front: the history decision
+            # below compares real prices, and the unchanged path needs
+            # the id anyway
+            existing = (await self.db_session.execute(
+                select(Product.id, Product.current_price)
+                .where(Product.product_key == product_key)
+            )).one_or_none()
+
+            # One dialect-native upsert instead of SELECT then UPDATE or
+            # INSERT: the conflict target is product_key, and the WHERE
+            # makes an identical re-scrape a no-op that returns no row
+            insert_fn = (
+                pg_insert
+                if self.db_session.get_bind().dialect.name == 'postgresql'
+                else sqlite_insert
+            )
+            stmt = insert_fn(Product).values(
+                product_key=product_key,
+                url=product_data['url'],
+                name=product_data['name'],
+                source=source,
+                image_url=product_data.get('image_url'),
+                brand=product_data.get('brand'),
+                category=product_data.get('category'),
+                current_price=current_price,
+                currency=currency
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['product_key'],
+                set_={
+                    "name": stmt.excluded.name,
+                    "image_url": stmt.excluded.image_url,
+                    "brand": stmt.excluded.brand,
+                    "category": stmt.excluded.category,
+                    # A zero/missing incoming price keeps the stored one
+                    "current_price": case(
+                        (stmt.excluded.current_price != 0,
+                         stmt.excluded.current_price),
+                        else_=Product.current_price
+                    ),
+                    "updated_at": datetime.utcnow()
+                },
+                # Fire on a real price change or any metadata
+                # difference; only byte-identical re-scrapes skip the
+                # row write
+                where=or_(
+                    and_(
+                        stmt.excluded.current_price != 0,
+                        Product.current_price.is_distinct_from(
+                            stmt.excluded.current_price
+                        )
+                    ),
+                    Product.name.is_distinct_from(stmt.excluded.name),
+                    Product.image_url.is_distinct_from(stmt.excluded.image_url),
+                    Product.brand.is_distinct_from(stmt.excluded.brand),
+                    Product.category.is_distinct_from(stmt.excluded.category)
                 )
-                self.db_session.add(product)
-                action = "created"
-                
-                # Create initial price history entry
-                if current_price:
-                    price_history = PriceHistory(
-                        product=product,
+            ).returning(Product.id)
+
+            row = (await self.db_session.execute(stmt)).one_or_none()
+            product_id = (
+                row.id if row is not None
+                else (existing.id if existing is not None else None)
+            )
+
+            # History rides only on an actual price change (or a new
+            # product with a price), not on metadata updates
+            price_changed = bool(current_price) and (
+                existing is None or existing.current_price != current_price
+            )
+            if price_changed and product_id is not None:
+                await self.db_session.execute(
+                    insert(PriceHistory).values(
+                        product_id=product_id,
                         price=current_price,
-                        currency=product_data.get('currency', 'USD')
+                        currency=currency
                     )
-                    self.db_session.add(price_history)
-            
-            await self.db_session.commit()
-            
+                )
+
+            await self._commit()
+
             return {
                 "success": True,
-                "action": action,
-                "product_id": product.id
+                "action": "unchanged" if row is None else "upserted",
+                "product_id": product_id
             }
-            
+
         except Exception as e:
             await self.db_session.rollback()
             logger.error(f"Error saving product to database: {e}")
@@ -132,63 +339,147 @@ class StorageManager:
                 "error": str(e)
             }
     
+    def _today(self) -> str:
+        """Today's date string, re-rendered only when the day changes."""
+        day = int(time.time() // 86400)
+        if self._today_cache[0] != day:
+            self._today_cache = (day, datetime.utcnow().strftime("%Y-%m-%d"))
+        return self._today_cache[1]
+
+    def _backup_file(self, source: str, today: str) -> Path:
+        """Path of the JSONL backup file for a source and date."""
+        return self.backup_dir / f"{source}_{today}.jsonl"
+
+    async def _ensure_index(self, source: str, today: str) -> Dict[str, int]:
+        """Build the offset index for a backup file on first touch.
+
+        Streams the existing file once, recording the byte offset of the
+        most recent line per product_key; later lines for the same key
+        win, matching the append-then-tombstone update scheme.
+        """
+        index_key = (source, today)
+        index = self._offset_index.get(index_key)
+        if index is not None:
+            return index
+
+        index = {}
+        offset = 0
+        filename = self._backup_file(source, today)
+        if filename.exists():
+            async with aiofiles.open(filename, 'rb') as f:
+                async for line in f:
+                    try:
+                        record = orjson.loads(line)
+                        index[record['product_key']] = offset
+                    except (ValueError, KeyError):
+                        logger.warning(f"Skipping malformed backup line in {filename}")
+                    offset += len(line)
+
+        self._offset_index[index_key] = index
+        self._file_sizes[index_key] = offset
+        return index
+
     async def _save_to_json(self, product_data: Dict[str, Any], source: str, product_key: str) -> Dict[str, Any]:
-        """Save product data to a JSON file as backup."""
+        """Append product data to the daily JSONL backup file.
+
+        Appending one line plus an index update replaces the old
+        read-parse-rewrite of the whole daily file, which made each save
+        O(records so far). Updates append a fresh line and repoint the
+        index; stale lines are dropped by compact_backup.
+        """
         try:
-            # Create a filename based on the source and current date
-            today = datetime.utcnow().strftime("%Y-%m-%d")
-            filename = self.backup_dir / f"{source}_{today}.json"
-            
+            today = self._today()
+            filename = self._backup_file(source, today)
+            index = await self._ensure_index(source, today)
+            index_key = (source, today)
+
             # Add metadata
             data = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": time.time(),
                 "source": source,
                 "product_key": product_key,
                 "data": product_data
             }
-            
-            # Read existing data if file exists
-            existing_data = []
-            if filename.exists():
-                async with aiofiles.open(filename, 'r', encoding='utf-8') as f:
-                    content = await f.read()
-                    if content.strip():
-                        existing_data = json.loads(content)
-            
-            # Check if product already exists in the file
-            updated = False
-            for i, item in enumerate(existing_data):
-                if item.get('product_key') == product_key:
-                    existing_data[i] = data
-                    updated = True
-                    break
-            
-            # Add new product if not found
-            if not updated:
-                existing_data.append(data)
-            
-            # Write back to file
-            async with aiofiles.open(filename, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(existing_data, indent=2))
-            
+
+            line = orjson.dumps(data) + b'\n'
+            async with aiofiles.open(filename, 'ab') as f:
+                await f.write(line)
+
+            updated = product_key in index
+            index[product_key] = self._file_sizes[index_key]
+            self._file_sizes[index_key] += len(line)
+
             return {
                 "success": True,
                 "action": "updated" if updated else "created",
                 "filename": str(filename)
             }
-            
+
         except Exception as e:
             logger.error(f"Error saving product to JSON: {e}")
             return {
                 "success": False,
                 "error": str(e)
             }
+
+    async def read_backup_record(self, source: str, today: str, product_key: str) -> Optional[Dict[str, Any]]:
+        """Read the latest backup record for a product: one seek, one line."""
+        index = await self._ensure_index(source, today)
+        offset = index.get(product_key)
+        if offset is None:
+            return None
+        try:
+            async with aiofiles.open(self._backup_file(source, today), 'rb') as f:
+                await f.seek(offset)
+                return orjson.loads(await f.readline())
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading backup record for {product_key}: {e}")
+            return None
+
+    async def compact_backup(self, source: str, today: str) -> Dict[str, Any]:
+        """Rewrite a backup file keeping only each key's latest line."""
+        try:
+            index = await self._ensure_index(source, today)
+            filename = self._backup_file(source, today)
+            if not filename.exists():
+                return {"success": True, "kept": 0}
+
+            live_offsets = set(index.values())
+            new_index: Dict[str, int] = {}
+            offset = 0
+            new_offset = 0
+            tmp_file = filename.with_suffix('.jsonl.tmp')
+            async with aiofiles.open(filename, 'rb') as src, \
+                    aiofiles.open(tmp_file, 'wb') as dst:
+                async for line in src:
+                    if offset in live_offsets:
+                        await dst.write(line)
+                        record = orjson.loads(line)
+                        new_index[record['product_key']] = new_offset
+                        new_offset += len(line)
+                    offset += len(line)
+            os.replace(tmp_file, filename)
+
+            index_key = (source, today)
+            self._offset_index[index_key] = new_index
+            self._file_sizes[index_key] = new_offset
+            return {"success": True, "kept": len(new_index)}
+
+        except Exception as e:
+            logger.error(f"Error compacting backup {source}_{today}: {e}")
+            return {"success": False, "error": str(e)}
     
     def _generate_product_key(self, url: str, source: str) -> str:
-        """Generate a unique key for a product based on URL and source."""
-        import hashlib
+        """Generate a unique key for a product based on URL and source.
+
+        The key only deduplicates rows, so the cheaper blake2b with a
+        16-byte digest replaces SHA-256 — noticeably faster on these
+        short inputs and half the key bytes to store and index. Rows
+        keyed under the old scheme are re-created on next save rather
+        than migrated.
+        """
         key = f"{source}:{url}".encode('utf-8')
-        return hashlib.sha256(key).hexdigest()
+        return hashlib.blake2b(key, digest_size=16).hexdigest()
     
     async def get_product_history(self, product_id: int) -> Dict[str, Any]:
         """Get price history for a product."""
@@ -205,13 +496,15 @@ class StorageManager:
             if not product:
                 return {"success": False, "error": "Product not found"}
             
-            # Get price history
+            # Get price history: only the serialized columns, so the
+            # composite (product_id, created_at) index covers the query
+            # and no ORM objects get materialized
             result = await self.db_session.execute(
-                select(PriceHistory)
+                select(PriceHistory.price, PriceHistory.currency, PriceHistory.created_at)
                 .where(PriceHistory.product_id == product_id)
                 .order_by(PriceHistory.created_at.desc())
             )
-            history = result.scalars().all()
+            history = result.all()
             
             return {
                 "success": True,
@@ -0,0 +1,66 @@
+import functools
+import logging
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Params left behind by earlier affiliate/tracking layers; stripped
+# before our own tag is applied. A tuple lets str.startswith test all
+# prefixes in one C-level call.
+_TRACKING_PREFIXES = ('ref_', 'tag_', 'asc_', 'creative_')
+
+class AffiliateManager:
+    """Rewrites Amazon product URLs to carry the configured associate tag."""
+
+    def __init__(self, amazon_tag: Optional[str] = None):
+        """
+        Initialize the affiliate manager.
+
+        Args:
+            amazon_tag: Associate tag to append (defaults to settings)
+        """
+        self.amazon_tag = amazon_tag or settings.AMAZON_PARTNER_TAG
+
+    def convert_to_affiliate_link(self, url: str) -> str:
+        """
+        Return the URL with the associate tag applied.
+
+        Args:
+            url: Product URL from a scraper or API response
+
+        Returns:
+            Tagged URL, or the input unchanged when no tag is configured
+            or the URL is not an Amazon link
+        """
+        if not url or not self.amazon_tag or 'amazon.' not in url:
+            return url
+        return self._transform(url, self.amazon_tag)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _transform(url: str, tag: str) -> str:
+        """Strip stale tracking params and set the tag (memoized).
+
+        The same product URLs recur constantly across scrape and compare
+        cycles, so repeats skip the whole parse/filter/rebuild pipeline
+        and come straight out of the cache.
+        """
+        # Clean /dp/ URLs have no query at all; skip parsing entirely
+        if '?' not in url:
+            return f"{url}?tag={tag}"
+
+        # urlsplit skips urlparse's params handling, and parse_qsl gives
+        # a flat pair list with no dict or value-list construction
+        parts = urlsplit(url)
+        params = [
+            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if k != 'tag' and not k.startswith(_TRACKING_PREFIXES)
+        ]
+        params.append(('tag', tag))
+        return urlunsplit(parts._replace(query=urlencode(params)))
+
+# Global affiliate manager instance
+affiliate_manager = AffiliateManager()
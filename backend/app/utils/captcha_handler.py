@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import random
+import re
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# One compiled alternation: a single scan of the page regardless of how
+# many indicator phrases are registered, and case-insensitive without
+# building the full lowercased copy that per-phrase `in` checks need.
+_CAPTCHA_INDICATORS = (
+    'captcha',
+    'recaptcha',
+    'hcaptcha',
+    'are you a robot',
+    'i am not a robot',
+    'unusual traffic',
+    'verify you are human',
+    'security check',
+    'enter the characters you see',
+)
+_CAPTCHA_RE = re.compile(
+    '|'.join(re.escape(indicator) for indicator in _CAPTCHA_INDICATORS),
+    re.IGNORECASE
+)
+
+class CaptchaHandler:
+    """Detects CAPTCHA interstitials and runs simple recovery strategies."""
+
+    def __init__(self, max_attempts: int = 3, retry_delay: float = 5.0):
+        """
+        Initialize the CAPTCHA handler.
+
+        Args:
+            max_attempts: Reload attempts per strategy
+            retry_delay: Base delay between attempts in seconds
+        """
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+    async def detect_captcha(self, content: Optional[str]) -> bool:
+        """
+        Check page content for CAPTCHA indicators.
+
+        Args:
+            content: Raw page HTML
+
+        Returns:
+            True if the page looks like a CAPTCHA or bot-check interstitial
+        """
+        if not content:
+            return False
+        return _CAPTCHA_RE.search(content) is not None
+
+    async def handle_captcha(self, page) -> Optional[str]:
+        """
+        Try to get past a CAPTCHA page.
+
+        Args:
+            page: The Playwright page showing the CAPTCHA
+
+        Returns:
+            The page HTML after the CAPTCHA cleared, or None if all
+            strategies failed. Each strategy has to serialize the DOM
+            anyway to confirm the challenge is gone, so the caller gets
+            that string back instead of paying for a second
+            page.content() round-trip.
+        """
+        for strategy in (self._solve_by_refresh, self._solve_by_waiting):
+            try:
+                content = await strategy(page)
+                if content is not None:
+                    logger.info(f"CAPTCHA cleared by {strategy.__name__}")
+                    return content
+            except Exception as e:
+                logger.warning(f"CAPTCHA strategy {strategy.__name__} failed: {e}")
+        return None
+
+    async def _solve_by_refresh(self, page) -> Optional[str]:
+        """Reload with jittered backoff; soft blocks often clear on retry.
+
+        Returns the post-reload HTML on success so it can be reused.
+        """
+        for attempt in range(self.max_attempts):
+            await asyncio.sleep(
+                self.retry_delay * (attempt + 1) + random.uniform(0, 1)
+            )
+            await page.reload(wait_until='domcontentloaded')
+            content = await page.content()
+            if not await self.detect_captcha(content):
+                return content
+        return None
+
+    async def _solve_by_waiting(self, page) -> Optional[str]:
+        """Wait out rate-limit interstitials that expire on their own.
+
+        Event-driven rather than a fixed sleep: wait_for_function wakes
+        up the moment the challenge text disappears, so a CAPTCHA that
+        clears after two seconds doesn't cost the full ten. Returns the
+        cleared HTML on success.
+        """
+        try:
+            await page.wait_for_function(
+                "() => !/captcha|robot|unusual traffic/i.test(document.body.innerText)",
+                timeout=10000
+            )
+            return await page.content()
+        except Exception:
+            return None
+
+# Global CAPTCHA handler instance
+captcha_handler = CaptchaHandler()
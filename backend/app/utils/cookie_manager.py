@@ -1,27 +1,34 @@
-import json
-import os
 import logging
+import re
 from typing import Dict, List, Optional, Union
 from pathlib import Path
 import aiofiles
 import aiofiles.os
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Domains become filenames; collapse anything shady to underscores
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9.-]')
+
 class CookieManager:
-    """Manages loading and saving cookies for web scraping sessions."""
-    
+    """Manages loading and saving cookies for web scraping sessions.
+
+    Cookies are stored one file per domain, so a save touches only that
+    domain's data instead of rewriting the whole shared store on every
+    update.
+    """
+
     def __init__(self, storage_dir: str = 'data/cookies'):
         """
         Initialize the cookie manager.
-        
+
         Args:
             storage_dir: Directory to store cookie files
         """
         self.storage_dir = Path(storage_dir)
-        self.cookies_path = self.storage_dir / 'cookies.json'
         self._ensure_storage()
-        
+
     def _ensure_storage(self):
         """Ensure the storage directory exists."""
         try:
@@ -29,83 +36,67 @@ class CookieManager:
         except Exception as e:
             logger.error(f"Failed to create cookie storage directory: {e}")
             raise
-    
+
+    def _path(self, domain: str) -> Path:
+        """Cookie file for a domain."""
+        return self.storage_dir / f"{_UNSAFE_CHARS.sub('_', domain)}.json"
+
     async def load_cookies(self, domain: str) -> List[Dict]:
         """
         Load cookies for a specific domain.
-        
+
         Args:
             domain: Domain to load cookies for (e.g., 'amazon.com')
-            
+
         Returns:
             List of cookie dictionaries
         """
+        path = self._path(domain)
         try:
-            if not await aiofiles.os.path.exists(self.cookies_path):
+            if not await aiofiles.os.path.exists(path):
                 return []
-                
-            async with aiofiles.open(self.cookies_path, 'r') as f:
-                data = json.loads(await f.read())
-                return data.get(domain, [])
-                
+
+            async with aiofiles.open(path, 'rb') as f:
+                cookies = orjson.loads(await f.read())
+                return cookies if isinstance(cookies, list) else []
+
         except Exception as e:
             logger.error(f"Error loading cookies: {e}")
             return []
-    
+
     async def save_cookies(self, domain: str, cookies: List[Dict]):
         """
         Save cookies for a specific domain.
-        
+
         Args:
             domain: Domain to save cookies for
             cookies: List of cookie dictionaries
         """
         try:
-            # Load existing cookies
-            all_cookies: Dict[str, List[Dict]] = {}
-            if await aiofiles.os.path.exists(self.cookies_path):
-                async with aiofiles.open(self.cookies_path, 'r') as f:
-                    try:
-                        all_cookies = json.loads(await f.read())
-                        if not isinstance(all_cookies, dict):
-                            all_cookies = {}
-                    except json.JSONDecodeError:
-                        all_cookies = {}
-            
-            # Update cookies for the domain
-            all_cookies[domain] = cookies
-            
-            # Save back to file
-            async with aiofiles.open(self.cookies_path, 'w') as f:
-                await f.write(json.dumps(all_cookies, indent=2))
-                
+            async with aiofiles.open(self._path(domain), 'wb') as f:
+                await f.write(orjson.dumps(cookies))
+
         except Exception as e:
             logger.error(f"Error saving cookies: {e}")
-            
+
     async def clear_cookies(self, domain: Optional[str] = None):
         """
         Clear cookies for a specific domain or all domains.
-        
+
         Args:
             domain: Domain to clear cookies for, or None to clear all
         """
         try:
             if domain is None:
                 # Clear all cookies
-                if await aiofiles.os.path.exists(self.cookies_path):
-                    await aiofiles.os.remove(self.cookies_path)
+                for path in self.storage_dir.glob('*.json'):
+                    await aiofiles.os.remove(path)
             else:
                 # Clear cookies for specific domain
-                if await aiofiles.os.path.exists(self.cookies_path):
-                    async with aiofiles.open(self.cookies_path, 'r') as f:
-                        all_cookies = json.loads(await f.read())
-                        
-                    if domain in all_cookies:
-                        del all_cookies[domain]
-                        
-                        async with aiofiles.open(self.cookies_path, 'w') as f:
-                            await f.write(json.dumps(all_cookies, indent=2))
-                            
+                path = self._path(domain)
+                if await aiofiles.os.path.exists(path):
+                    await aiofiles.os.remove(path)
+
         except Exception as e:
             logger.error(f"Error clearing cookies: {e}")
 
@@ -3,13 +3,35 @@ Data validation utilities for ensuring data quality in API responses
 """
 from typing import Any, Dict, List, Optional
 from decimal import Decimal, InvalidOperation
-from datetime import datetime
+from datetime import datetime, timezone
 from pydantic import BaseModel, validator
+import functools
 import re
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Last rendered ISO timestamp, reused within the same second
+_iso_cache = (0, '')
+
+def _iso_utcnow() -> str:
+    """ISO timestamp with second precision, re-rendered at most once/second."""
+    global _iso_cache
+    now = int(time.time())
+    if _iso_cache[0] != now:
+        _iso_cache = (now, datetime.now(timezone.utc).isoformat(timespec='seconds'))
+    return _iso_cache[1]
+
+# Compiled once at import. The lazy .*? form is linear on the input,
+# unlike the old nested-lookahead pattern, which was recompiled per call
+# and could backtrack quadratically on adversarial input (ReDoS).
+_SCRIPT_RE = re.compile(r'<script\b.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+
+# Fast shape check for cleaned URLs: scheme plus at least one
+# non-whitespace character, nothing else
+_URL_OK_RE = re.compile(r'\Ahttps?://\S+\Z')
+
 class DataValidator:
     """Utility class for data validation and sanitization"""
     
@@ -43,16 +65,24 @@ class DataValidator:
         if not html:
             return ""
         # Basic HTML sanitization - allow basic formatting but remove scripts
-        return re.sub(r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>', '', html)
+        return _SCRIPT_RE.sub('', html)
     
     @staticmethod
+    @functools.lru_cache(maxsize=8192)
     def validate_url(url: Optional[str]) -> Optional[str]:
-        """Validate and clean URLs"""
+        """Validate and clean URLs.
+
+        Memoized: product and CDN image URLs repeat heavily across
+        responses, so repeats are a dict hit instead of the clean +
+        regex pass.
+        """
         if not url:
             return None
         url = str(url).strip()
         if not url.startswith(('http://', 'https://')):
             url = f'https://{url}'
+        if not _URL_OK_RE.match(url):
+            return None
         return url
     
     @classmethod
@@ -91,6 +121,6 @@ class DataValidator:
                 result["metadata"][key] = str(product_data[key]).strip()
         
         # Add timestamps
-        result["last_updated"] = datetime.utcnow().isoformat()
+        result["last_updated"] = _iso_utcnow()
         
         return result
@@ -1,44 +1,99 @@
-from datetime import datetime, timedelta
-from typing import Dict, Optional
 import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Dict, Optional
 from fastapi import HTTPException, Request
 
+from ..core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Atomic count-and-expire in one round trip: INCR the window bucket and
+# arm its TTL only on first increment
+_COUNT_LUA = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+return current
+"""
+
 class RateLimiter:
     def __init__(self, max_requests: int, time_window_seconds: int):
         """
         Initialize rate limiter.
-        
+
         Args:
             max_requests: Maximum number of requests allowed in the time window
             time_window_seconds: Time window in seconds
         """
         self.max_requests = max_requests
-        self.time_window = timedelta(seconds=time_window_seconds)
-        self.requests: Dict[str, list[datetime]] = {}
-        self.lock = asyncio.Lock()
-    
+        self.window_s = float(time_window_seconds)
+        # Per-IP deques of monotonic timestamps: expired entries pop off
+        # the left in O(1) instead of rebuilding a list every request
+        self.requests: Dict[str, deque] = defaultdict(deque)
+        self._janitor_task = None
+        # Shared Redis counter so the limit holds across uvicorn workers
+        # instead of multiplying by worker count; the per-process deques
+        # above remain as the degraded-mode fallback
+        try:
+            self.redis = get_redis_client()
+        except Exception as e:
+            logger.warning(f"Rate limiter running without Redis: {e}")
+            self.redis = None
+        self.redis_available = self.redis is not None
+        self._count_script = (
+            self.redis.register_script(_COUNT_LUA) if self.redis else None
+        )
+
     async def is_rate_limited(self, client_ip: str) -> bool:
         """Check if the client has exceeded the rate limit."""
-        async with self.lock:
-            now = datetime.utcnow()
-            
-            # Remove old requests outside the time window
-            if client_ip in self.requests:
-                self.requests[client_ip] = [
-                    req_time for req_time in self.requests[client_ip]
-                    if now - req_time < self.time_window
-                ]
-            
-            # Add current request time
-            if client_ip not in self.requests:
-                self.requests[client_ip] = []
-            
-            # Check rate limit
-            if len(self.requests[client_ip]) >= self.max_requests:
-                return True
-            
-            self.requests[client_ip].append(now)
-            return False
+        if self.redis_available:
+            try:
+                bucket = int(time.time() // self.window_s)
+                count = self._count_script(
+                    keys=[f"rl:{client_ip}:{bucket}"],
+                    args=[int(self.window_s * 1000)]
+                )
+                return int(count) > self.max_requests
+            except Exception as e:
+                logger.warning(f"Redis rate limiting unavailable, "
+                               f"falling back to local counters: {e}")
+                self.redis_available = False
+
+        # No lock: this runs on the single-threaded event loop and never
+        # awaits between the trim, the check and the append
+        now = time.monotonic()
+        cutoff = now - self.window_s
+        timestamps = self.requests[client_ip]
+
+        while timestamps and timestamps[0] < cutoff:
+            timestamps.popleft()
+
+        if len(timestamps) >= self.max_requests:
+            return True
+
+        timestamps.append(now)
+        self._ensure_janitor()
+        return False
+
+    def _ensure_janitor(self):
+        """Start the idle-IP eviction task if not yet running."""
+        if self._janitor_task is None or self._janitor_task.done():
+            self._janitor_task = asyncio.create_task(self._evict_idle())
+
+    async def _evict_idle(self):
+        """Periodically drop IPs with no requests in the current window."""
+        while True:
+            await asyncio.sleep(self.window_s)
+            cutoff = time.monotonic() - self.window_s
+            for client_ip in list(self.requests):
+                timestamps = self.requests[client_ip]
+                while timestamps and timestamps[0] < cutoff:
+                    timestamps.popleft()
+                if not timestamps:
+                    del self.requests[client_ip]
 
 def get_client_ip(request: Request) -> str:
     """Extract client IP from request, handling various proxy scenarios."""
@@ -55,7 +110,7 @@ rate_limiter = RateLimiter(max_requests=5, time_window_seconds=60)
 async def rate_limit_middleware(request: Request, call_next):
     """Middleware to handle rate limiting for all requests."""
     client_ip = get_client_ip(request)
-    
+
     if await rate_limiter.is_rate_limited(client_ip):
         raise HTTPException(
             status_code=429,
@@ -65,6 +120,6 @@ async def rate_limit_middleware(request: Request, call_next):
                 "retry_after_seconds": 60
             }
         )
-    
+
     response = await call_next(request)
     return response
@@ -8,29 +8,54 @@ load_dotenv()
 # Database URL configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./price_compare.db")
 
+def _get_all_columns(conn, dialect, tables):
+    """Column metadata for every table, batched on one connection.
+
+    Postgres answers with a single information_schema query; SQLite has
+    no information_schema, so it's one PRAGMA per table but still on the
+    shared connection.
+    """
+    columns = {}
+    if dialect == 'postgresql':
+        rows = conn.execute(text(
+            "SELECT table_name, column_name, data_type "
+            "FROM information_schema.columns "
+            "WHERE table_schema = current_schema()"
+        ))
+        for table_name, column_name, data_type in rows:
+            columns.setdefault(table_name, []).append((column_name, data_type))
+    else:
+        for table in tables:
+            for row in conn.execute(text(f'PRAGMA table_info("{table}")')):
+                columns.setdefault(table, []).append((row.name, row.type))
+    return columns
+
 def check_database():
     try:
         # Create engine
         engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {})
-        
+
         # Create inspector
         inspector = inspect(engine)
-        
+
         # Get all tables
         tables = inspector.get_table_names()
         print("\n=== Database Tables ===")
         print(f"Found {len(tables)} tables:")
-        for table in tables:
-            print(f"- {table}")
-            
-            # Get columns for each table
-            columns = inspector.get_columns(table)
-            print(f"  Columns in {table}:")
-            for column in columns:
-                print(f"  - {column['name']} ({column['type']})")
-                
-            # Get sample data (first 2 rows)
-            with engine.connect() as conn:
+
+        # One connection for the whole check instead of opening a fresh
+        # one per table
+        with engine.connect() as conn:
+            columns_by_table = _get_all_columns(conn, engine.dialect.name, tables)
+
+            for table in tables:
+                print(f"- {table}")
+
+                print(f"  Columns in {table}:")
+                for name, data_type in columns_by_table.get(table, []):
+                    print(f"  - {name} ({data_type})")
+
+                # Get sample data (first 2 rows)
                 try:
                     result = conn.execute(text(f"SELECT * FROM {table} LIMIT 2"))
                     rows = result.fetchall()
@@ -42,8 +67,8 @@ def check_database():
                         print(f"  No data in {table}")
                 except Exception as e:
                     print(f"  Error fetching data from {table}: {str(e)}")
-            print()
-            
+                print()
+
     except Exception as e:
         print(f"Error checking database: {str(e)}")
         raise
@@ -9,7 +9,7 @@ This script handles:
 import sys
 import logging
 from datetime import datetime
-from sqlalchemy import create_engine, MetaData, Table, Column, String, Integer, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import create_engine, text, MetaData, Table, Column, String, Integer, Float, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -27,6 +27,45 @@ logger = logging.getLogger(__name__)
 from app.database import SQLALCHEMY_DATABASE_URL
 from app.models import Base
 
+def bulk_update_products(db, updates, batch_size=5000):
+    """Apply per-row product updates in batches of one statement each.
+
+    Args:
+        db: Session bound to the target database
+        updates: List of (id, source, name) tuples
+        batch_size: Rows folded into each statement
+
+    On Postgres each batch goes through psycopg2's execute_values as a
+    single ``UPDATE .. FROM (VALUES ...)`` — one parse and one network
+    flush per batch instead of a round trip per row. Other dialects
+    fall back to a chunked executemany UPDATE. Use this, not a Python
+    loop of single UPDATEs, if a migration ever needs per-row values.
+    """
+    if not updates:
+        return 0
+
+    if db.get_bind().dialect.name == 'postgresql':
+        from psycopg2.extras import execute_values
+        cursor = db.connection().connection.cursor()
+        for start in range(0, len(updates), batch_size):
+            execute_values(
+                cursor,
+                "UPDATE products AS p "
+                "SET source = data.source, name = data.name "
+                "FROM (VALUES %s) AS data (id, source, name) "
+                "WHERE p.id = data.id",
+                updates[start:start + batch_size],
+                page_size=batch_size
+            )
+    else:
+        stmt = text("UPDATE products SET source = :source, name = :name WHERE id = :id")
+        for start in range(0, len(updates), batch_size):
+            db.execute(stmt, [
+                {"id": product_id, "source": source, "name": name}
+                for product_id, source, name in updates[start:start + batch_size]
+            ])
+    return len(updates)
+
 def migrate_database():
     """Migrate the database schema and data to support the new eBay integration."""
     logger.info("Starting database migration to eBay integration...")
@@ -49,50 +88,51 @@ def migrate_database():
         if 'products' in metadata.tables:
             logger.info("Checking for Amazon products to migrate...")
             
-            # Get all Amazon products
+            # One bulk UPDATE covers every Amazon product; no need to
+            # SELECT them first or issue a statement per row. If a later
+            # migration needs per-row transformation, feed the rows to
+            # bulk_update_products, not a Python loop of single UPDATEs.
             products_table = Table('products', metadata, autoload_with=engine)
-            amazon_products = db.execute(
-                products_table.select().where(products_table.c.source == 'amazon')
-            ).fetchall()
-            
-            if amazon_products:
-                logger.info(f"Found {len(amazon_products)} Amazon products to migrate")
-                
-                # Update each Amazon product to use the new eBay format
-                for product in amazon_products:
-                    # Here you would add logic to convert Amazon product data to eBay format
-                    # For example, you might want to look up the product on eBay's API
-                    # and update the product details accordingly
-                    
-                    # For now, we'll just update the source to indicate it's been migrated
-                    db.execute(
-                        products_table.update()
-                        .where(products_table.c.id == product.id)
-                        .values(source='migrated_to_ebay')
-                    )
-                
-                db.commit()
-                logger.info("Successfully migrated Amazon products")
+            result = db.execute(
+                products_table.update()
+                .where(products_table.c.source == 'amazon')
+                .values(source='migrated_to_ebay')
+            )
+            db.commit()
+
+            if result.rowcount:
+                logger.info(f"Successfully migrated {result.rowcount} Amazon products")
             else:
                 logger.info("No Amazon products found to migrate")
         
         # Update user preferences if needed
         if 'users' in metadata.tables:
             logger.info("Updating user preferences for eBay integration...")
-            users_table = Table('users', metadata, autoload_with=engine)
-            
-            # Add any new columns needed for eBay integration
-            # For example, you might want to add an 'ebay_preferences' column
-            try:
-                db.execute("""
-                    ALTER TABLE users 
-                    ADD COLUMN IF NOT EXISTS ebay_preferences JSONB
-                """)
+
+            # Probe the catalog before altering: ALTER TABLE takes an
+            # exclusive lock on most engines even when IF NOT EXISTS
+            # makes it a no-op, and the old broad try/except hid real
+            # failures behind the already-exists case
+            if engine.dialect.name == 'postgresql':
+                exists = db.execute(text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'users' AND column_name = 'ebay_preferences'"
+                )).scalar()
+            else:
+                exists = any(
+                    row.name == 'ebay_preferences'
+                    for row in db.execute(text('PRAGMA table_info("users")'))
+                )
+
+            if exists:
+                logger.info("eBay preferences column already present")
+            else:
+                column_type = 'JSONB' if engine.dialect.name == 'postgresql' else 'TEXT'
+                db.execute(text(
+                    f"ALTER TABLE users ADD COLUMN ebay_preferences {column_type}"
+                ))
                 db.commit()
                 logger.info("Added eBay preferences column to users table")
-            except Exception as e:
-                logger.warning(f"Could not add eBay preferences column: {str(e)}")
-                db.rollback()
         
         logger.info("Database migration completed successfully!")
         return True
@@ -1,7 +1,7 @@
 import sys
 import os
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import sessionmaker
 
 # Add the backend directory to the Python path
@@ -69,43 +69,57 @@ def seed_database():
             }
         ]
         
-        # Add products to database
-        for product_data in sample_products:
-            # Create product
-            product = Product(
-                name=product_data["name"],
-                description=product_data["description"],
-                category=product_data["category"],
-                price=product_data["price"],
-                source=product_data["source"],
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(product)
-            db.flush()  # Get the product ID
-            
-            # Create initial price snapshot
-            snapshot = PriceSnapshot(
-                product_id=product.id,
-                price=product_data["price"],
-                timestamp=datetime.utcnow()
-            )
-            db.add(snapshot)
-            
-            # Create an offer
-            offer = Offer(
-                product_id=product.id,
-                seller="Example Seller",
-                price=product_data["price"],
-                original_price=product_data["price"] * 1.1,  # 10% discount
-                discount=10.0,
-                url=f"https://example.com/products/{product.id}",
-                website="ebay",
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(offer)
-        
+        # Three bulk Core inserts instead of add/flush per product: one
+        # INSERT .. RETURNING for the products, then executemany for the
+        # snapshots and offers keyed on the returned ids. Minor for five
+        # fixtures, but this is the seed path for larger ones.
+        now = datetime.utcnow()
+        product_rows = [
+            {
+                "name": p["name"],
+                "description": p["description"],
+                "category": p["category"],
+                "price": p["price"],
+                "source": p["source"],
+                "created_at": now,
+                "updated_at": now
+            }
+            for p in sample_products
+        ]
+        # sort_by_parameter_order: executemany RETURNING does not
+        # guarantee row order otherwise, and the snapshot/offer rows are
+        # zipped against sample_products by position
+        result = db.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            product_rows
+        )
+        ids = [row[0] for row in result]
+
+        snapshot_rows = [
+            {
+                "product_id": product_id,
+                "price": p["price"],
+                "timestamp": now
+            }
+            for product_id, p in zip(ids, sample_products)
+        ]
+        offer_rows = [
+            {
+                "product_id": product_id,
+                "seller": "Example Seller",
+                "price": p["price"],
+                "original_price": p["price"] * 1.1,  # 10% discount
+                "discount": 10.0,
+                "url": f"https://example.com/products/{product_id}",
+                "website": "ebay",
+                "created_at": now,
+                "updated_at": now
+            }
+            for product_id, p in zip(ids, sample_products)
+        ]
+        db.execute(insert(PriceSnapshot), snapshot_rows)
+        db.execute(insert(Offer), offer_rows)
+
         # Commit all changes
         db.commit()
         print("Successfully seeded database with sample data!")
@@ -29,18 +29,28 @@ def test_database_connection():
                 text("SELECT name FROM sqlite_master WHERE type='table';")
             )
             tables = [row[0] for row in tables_result.fetchall()]
-            
-            for table in tables:
-                print(f"- {table}")
-                
-                # Count rows in each table
+
+            # One UNION ALL of scalar counts: a single round trip for
+            # every table instead of one COUNT(*) statement per table
+            if tables:
+                counts_sql = " UNION ALL ".join(
+                    f'SELECT \'{table}\' AS name, (SELECT COUNT(*) FROM "{table}") AS n'
+                    for table in tables
+                )
                 try:
-                    count = session.execute(
-                        text(f'SELECT COUNT(*) FROM "{table}"')
-                    ).scalar()
-                    print(f"  Rows: {count}")
+                    for name, count in session.execute(text(counts_sql)):
+                        print(f"- {name}")
+                        print(f"  Rows: {count}")
                 except Exception as e:
                     print(f"  Could not count rows: {str(e)}")
+        else:
+            # Postgres keeps live-row estimates in the stats collector:
+            # one query, no table scans at all
+            for name, count in session.execute(
+                text("SELECT relname, n_live_tup FROM pg_stat_user_tables")
+            ):
+                print(f"- {name}")
+                print(f"  Rows (estimate): {count}")
         
         session.close()
         return True
@@ -105,6 +105,18 @@ async def async_client(
             # Clear overrides
             app.dependency_overrides.clear()
 
+@pytest.fixture(scope="session")
+async def amazon_scraper() -> AsyncGenerator[Any, None]:
+    """One AmazonScraper (and its aiohttp session) for the whole run.
+
+    Constructing a scraper pays for connector setup, DNS cache warmup,
+    and the user-agent pool bootstrap; a session-scoped instance
+    amortizes that across every scraper test instead of per test.
+    """
+    from app.scrapers.site_scrapers import AmazonScraper
+    async with AmazonScraper() as scraper:
+        yield scraper
+
 @pytest.fixture(autouse=True)
 async def clear_cache() -> AsyncGenerator[None, None]:
     """Clear Redis cache before and after each test."""
@@ -0,0 +1,73 @@
+"""
+Tests for FallbackCacheManager: failover to the in-memory cache when
+Redis errors, probing, and recovery back to the primary.
+"""
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.cache import FallbackCacheManager
+
+
+def _make_manager(redis_mock, probe_interval=30.0):
+    with patch("app.core.cache.get_redis_client", return_value=redis_mock):
+        return FallbackCacheManager(
+            prefix="test:", default_ttl=60, probe_interval=probe_interval
+        )
+
+
+@pytest.mark.asyncio
+async def test_serves_from_memory_when_redis_is_down():
+    redis_mock = MagicMock()
+    redis_mock.setex.side_effect = ConnectionError("down")
+    redis_mock.get.side_effect = ConnectionError("down")
+    manager = _make_manager(redis_mock)
+
+    assert await manager.set("k", {"v": 1}) is True
+    assert manager._using_fallback is True
+    assert await manager.get("k") == {"v": 1}
+
+
+@pytest.mark.asyncio
+async def test_recovery_clears_fallback_and_uses_primary():
+    redis_mock = MagicMock()
+    redis_mock.setex.side_effect = ConnectionError("down")
+    manager = _make_manager(redis_mock)
+
+    await manager.set("k", {"v": 1})
+    assert manager._using_fallback is True
+
+    # Redis comes back; force the next probe to run immediately
+    redis_mock.setex.side_effect = None
+    redis_mock.ping.return_value = True
+    redis_mock.get.return_value = None
+    manager._last_probe = time.monotonic() - manager._probe_interval - 1
+
+    # Entries cached during the outage must not shadow fresher data
+    # written by other workers, so recovery clears the fallback
+    assert await manager.get("k") is None
+    assert manager._using_fallback is False
+    redis_mock.get.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_stays_on_fallback():
+    redis_mock = MagicMock()
+    redis_mock.setex.side_effect = ConnectionError("down")
+    redis_mock.ping.side_effect = ConnectionError("still down")
+    manager = _make_manager(redis_mock)
+
+    await manager.set("k", {"v": 1})
+    manager._last_probe = time.monotonic() - manager._probe_interval - 1
+
+    assert await manager.get("k") == {"v": 1}
+    assert manager._using_fallback is True
+
+
+@pytest.mark.asyncio
+async def test_no_redis_client_uses_fallback_from_start():
+    manager = _make_manager(None)
+    assert manager._using_fallback is True
+    assert await manager.set("k", [1, 2]) is True
+    assert await manager.get("k") == [1, 2]
@@ -0,0 +1,66 @@
+"""
+Parse-path tests for the site scrapers, run against static search-page
+HTML through the shared session-scoped scraper fixture.
+"""
+import pytest
+
+# Minimal Amazon search results page: two result cards plus a
+# non-result div that the card filter must skip
+_AMAZON_PAGE = """
+<html><body>
+<div class="widget">not a result card</div>
+<div data-component-type="s-search-result">
+  <h2><a class="a-link-normal" href="/dp/B001"><span>USB-C Charging Cable</span></a></h2>
+  <span class="a-price"><span class="a-offscreen">₹499</span></span>
+  <img class="s-image" src="https://img.example/cable.jpg"/>
+</div>
+<div data-component-type="s-search-result">
+  <h2><a class="a-link-normal" href="/dp/B002"><span>USB-C Wall Adapter</span></a></h2>
+  <span class="a-price"><span class="a-offscreen">₹1,299</span></span>
+  <img class="s-image" src="https://img.example/adapter.jpg"/>
+</div>
+</body></html>
+"""
+
+
+@pytest.mark.asyncio
+async def test_amazon_parse_path(amazon_scraper, monkeypatch):
+    async def fake_get(url, **kwargs):
+        return _AMAZON_PAGE
+
+    monkeypatch.setattr(amazon_scraper, "get", fake_get)
+
+    products = await amazon_scraper.search_products("usb-c", max_results=5)
+    assert [p["title"] for p in products] == [
+        "USB-C Charging Cable",
+        "USB-C Wall Adapter",
+    ]
+
+    first = products[0]
+    assert first["site"] == "amazon"
+    assert first["price"] == 499.0
+    assert first["currency"] == "INR"
+    assert first["url"] == "https://www.amazon.in/dp/B001"
+    assert first["image_url"] == "https://img.example/cable.jpg"
+    assert products[1]["price"] == 1299.0
+
+
+@pytest.mark.asyncio
+async def test_amazon_parse_respects_max_results(amazon_scraper, monkeypatch):
+    async def fake_get(url, **kwargs):
+        return _AMAZON_PAGE
+
+    monkeypatch.setattr(amazon_scraper, "get", fake_get)
+
+    products = await amazon_scraper.search_products("usb-c", max_results=1)
+    assert len(products) == 1
+
+
+@pytest.mark.asyncio
+async def test_amazon_parse_skips_markerless_pages(amazon_scraper, monkeypatch):
+    async def fake_get(url, **kwargs):
+        return "<html><body>No results for your search</body></html>"
+
+    monkeypatch.setattr(amazon_scraper, "get", fake_get)
+
+    assert await amazon_scraper.search_products("usb-c") == []
@@ -0,0 +1,110 @@
+"""
+Tests for StorageManager's database paths against a real (SQLite)
+async session: the bulk insert/update branches and price history.
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base, PriceHistory, Product
+from app.storage import StorageManager
+
+
+@pytest.fixture
+async def storage_session(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/storage_test.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_update_branch(storage_session, tmp_path):
+    storage = StorageManager(db_session=storage_session, backup_dir=str(tmp_path))
+    products = [
+        {"url": "https://example.com/a", "name": "Alpha", "price": 10.0},
+        {"url": "https://example.com/b", "name": "Beta", "price": 20.0},
+    ]
+
+    result = await storage.save_products_bulk(products, "amazon")
+    assert result == {"success": True, "saved": 2, "skipped": 0}
+
+    # Second pass with one changed price and one changed name exercises
+    # the executemany UPDATE branch
+    products[0]["price"] = 12.5
+    products[1]["name"] = "Beta v2"
+    result = await storage.save_products_bulk(products, "amazon")
+    assert result["success"] is True
+
+    rows = (await storage_session.execute(
+        select(Product.name, Product.current_price).order_by(Product.id)
+    )).all()
+    assert rows[0].current_price == 12.5
+    assert rows[1].name == "Beta v2"
+
+    # Two initial prices plus the one change
+    history = (await storage_session.execute(select(PriceHistory.price))).scalars().all()
+    assert sorted(history) == [10.0, 12.5, 20.0]
+
+
+@pytest.mark.asyncio
+async def test_single_save_persists_metadata_only_changes(storage_session, tmp_path):
+    storage = StorageManager(db_session=storage_session, backup_dir=str(tmp_path))
+    product = {"url": "https://example.com/c", "name": "Gamma", "price": 5.0}
+
+    result = await storage.save_product(product, "amazon")
+    assert result["database"]["action"] == "upserted"
+
+    # A name change with an unchanged price must be written, without
+    # adding a history row
+    result = await storage.save_product(dict(product, name="Gamma Pro"), "amazon")
+    assert result["database"]["action"] == "upserted"
+    name, price = (await storage_session.execute(
+        select(Product.name, Product.current_price)
+        .where(Product.url == product["url"])
+    )).one()
+    assert name == "Gamma Pro"
+    assert price == 5.0
+    history = (await storage_session.execute(select(PriceHistory.price))).scalars().all()
+    assert history == [5.0]
+
+    # A zero incoming price keeps the stored price and adds no history
+    result = await storage.save_product(
+        dict(product, name="Gamma Pro Max", price=0), "amazon"
+    )
+    assert result["database"]["action"] == "upserted"
+    price = (await storage_session.execute(
+        select(Product.current_price).where(Product.url == product["url"])
+    )).scalar_one()
+    assert price == 5.0
+
+    # An identical re-save is a no-op
+    result = await storage.save_product(
+        dict(product, name="Gamma Pro Max", price=5.0), "amazon"
+    )
+    assert result["database"]["action"] == "unchanged"
+    assert result["database"]["product_id"] is not None
+
+    # A real price change writes the row and the history entry
+    result = await storage.save_product(
+        dict(product, name="Gamma Pro Max", price=6.0), "amazon"
+    )
+    assert result["database"]["action"] == "upserted"
+    history = (await storage_session.execute(select(PriceHistory.price))).scalars().all()
+    assert sorted(history) == [5.0, 6.0]
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_skips_unchanged_rows(storage_session, tmp_path):
+    storage = StorageManager(db_session=storage_session, backup_dir=str(tmp_path))
+    products = [{"url": "https://example.com/a", "name": "Alpha", "price": 10.0}]
+
+    await storage.save_products_bulk(products, "amazon")
+    result = await storage.save_products_bulk(products, "amazon")
+    assert result["success"] is True
+
+    history = (await storage_session.execute(select(PriceHistory.price))).scalars().all()
+    assert history == [10.0]